@@ -0,0 +1,93 @@
+"""
+Engine analysis on a background thread, so the pygame window keeps
+responding while the engine thinks.
+
+The worker searches its own copy of the position (passed as
+Bitboards.pack()) and reports back through ANALYSIS_EVENT: one 'info'
+event per completed iteration and a final 'done' event. Every event carries
+the zobrist key of the position it is about, so results for a position
+that is no longer on the board can be told apart and ignored.
+"""
+import threading
+
+import pygame
+
+from .core.bitboard import Bitboards
+from .core.search import Search
+from .core import movecode
+from .core import parallel
+
+ANALYSIS_EVENT = pygame.event.custom_type()
+
+
+class AnalysisWorker:
+
+    def __init__(self, tt_size_mb=16):
+        from .core.engine import Engine
+
+        # private engine: the search plays moves on its board in place
+        self.engine = Engine(tt_size_mb)
+        self.thread = None
+        self.stop_event = None
+        self.key = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, engine, max_depth=64, time_limit=None, play=False):
+        """
+        Starts analysing the current position of 'engine', cancelling any
+        analysis still running. With play=True the 'done' event is meant to
+        be played as the engine's move.
+        """
+        self.cancel()
+        self.key = engine.board.hash
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(parallel.pack(engine), engine.history.recent(), self.key, self.stop_event,
+                  max_depth, time_limit, play),
+            daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        # the search checks the stop flag every few hundred nodes,
+        # so waiting for the thread takes a few milliseconds at most
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        self.key = None
+
+    def _run(self, packed, history, key, stop_event, max_depth, time_limit, play):
+        engine = self.engine
+        bbs = Bitboards.unpack(packed)
+        engine.board = bbs.to_board()
+        engine.next_player = bbs.next_player
+        # the game's recent positions, so the search sees repetitions
+        engine.history = history
+        sign = 1 if engine.next_player == 'white' else -1
+
+        def info(result):
+            self._post('info', key, result, sign, play)
+
+        search = Search(engine, max_depth, time_limit, None, engine.tt,
+                        stop_event=stop_event, info=info)
+        result = search.run()
+        if not stop_event.is_set():
+            self._post('done', key, result, sign, play)
+
+    def _post(self, kind, key, result, sign, play):
+        pygame.event.post(pygame.event.Event(ANALYSIS_EVENT, {
+            'kind': kind,
+            'key': key,
+            'play': play,
+            'code': result.code,
+            'depth': result.depth,
+            # white's point of view
+            'score': result.score * sign,
+            'pv': [movecode.uci(code) for code in result.pv],
+            'nodes': result.nodes,
+            'time': result.time,
+        }))
@@ -0,0 +1,185 @@
+"""
+Headless batch analysis of a move log: the binary game store written by
+the UI (game_log.bin) or an older CSV log (game_log.csv).
+
+    python -m src.analyze_log [game_log.bin] [-o analysis.csv] [--depth 2]
+
+Rows are streamed in fixed-size chunks and replayed through Board.move one
+at a time, so memory stays bounded however long the log is. The CSV log
+has no game ids: a new game starts whenever a white move doesn't
+fit the current game but is legal from the start position. Rows that fit
+neither are counted as skipped and the replay waits for the next game start.
+
+Each move is written out with the evaluation (white's point of view, in
+pawns) of the position it leads to, the engine's preferred move in the
+position before it, how much the move lost for the player who made it and
+a blunder flag.
+"""
+import argparse
+import csv
+import time
+from itertools import islice
+
+from .core.engine import Engine
+from .core.move import Move
+from .core.square import Square
+from .core import movecode
+
+OUTPUT_FIELDS = ['game', 'ply', 'player', 'piece', 'move', 'eval', 'best', 'loss', 'blunder']
+
+
+def read_chunks(path, chunk_size=10000):
+    """
+    Yields lists of at most 'chunk_size' row dicts (a .bin game store is
+    read through GameStore.rows).
+    """
+    if path.endswith('.bin'):
+        from .gamestore import GameStore
+
+        with GameStore(path) as store:
+            rows = store.rows()
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def parse_pos(text):
+    # the log stores squares as "col,row"
+    col, row = text.split(',')
+    return int(row), int(col)
+
+
+class GameReplayer:
+
+    def __init__(self, depth=2, blunder=2.0):
+        self.engine = Engine()
+        self.depth = depth
+        self.blunder = blunder
+        self.game = 0
+        self.ply = 0
+        # True while rows don't fit any game (waiting for a new one)
+        self.lost = True
+        self.skipped = 0
+        # engine verdict on the current position (white's view, best move)
+        self.eval = 0.0
+        self.best = None
+
+    def feed(self, row):
+        """
+        Replays one log row and returns its output record (None if skipped).
+        """
+        move = Move(Square(*parse_pos(row['initial_pos'])), Square(*parse_pos(row['final_pos'])))
+        code = movecode.from_move(move)
+
+        if self.lost or not self.fits(row, code):
+            if row['player'] != 'white' or not self.start_game(code):
+                self.lost = True
+                self.skipped += 1
+                return None
+
+        engine = self.engine
+        piece = engine.board.squares[move.initial.row][move.initial.col].piece
+        before, best = self.eval, self.best
+        # a game move, so the repetition history and clocks follow
+        engine.make_code(code)
+        self.ply += 1
+        self.evaluate()
+
+        # what the move cost its player, from their point of view
+        sign = 1 if row['player'] == 'white' else -1
+        loss = max(0.0, (before - self.eval) * sign)
+        return {
+            'game': self.game,
+            'ply': self.ply,
+            'player': row['player'],
+            'piece': piece.name,
+            'move': movecode.uci(code),
+            'eval': round(self.eval, 3) + 0.0,
+            'best': best or '',
+            'loss': round(loss, 3),
+            'blunder': int(loss >= self.blunder),
+        }
+
+    def fits(self, row, code):
+        engine = self.engine
+        if row['player'] != engine.next_player:
+            return False
+        keys = {movecode.key(legal) for legal in engine.legal_moves()}
+        return movecode.key(code) in keys
+
+    def start_game(self, code):
+        self.engine.reset()
+        self.engine.tt.clear()
+        if movecode.key(code) not in {movecode.key(legal) for legal in self.engine.legal_moves()}:
+            return False
+        self.game += 1
+        self.ply = 0
+        self.lost = False
+        self.evaluate()
+        return True
+
+    def evaluate(self):
+        # depth 0: replay only (used to split a log into games)
+        if not self.depth:
+            return
+        engine = self.engine
+        result = engine.search(max_depth=self.depth)
+        sign = 1 if engine.next_player == 'white' else -1
+        self.eval = result.score * sign
+        self.best = movecode.uci(result.code) if result.code is not None else None
+
+
+def analyze(path, output, depth=2, blunder=2.0, chunk_size=10000):
+    replayer = GameReplayer(depth, blunder)
+    moves = blunders = 0
+    start = time.perf_counter()
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for chunk in read_chunks(path, chunk_size):
+            for row in chunk:
+                record = replayer.feed(row)
+                if record is not None:
+                    writer.writerow(record)
+                    moves += 1
+                    blunders += record['blunder']
+            f.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'games': replayer.game,
+        'moves': moves,
+        'blunders': blunders,
+        'skipped': replayer.skipped,
+        'seconds': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate every move in a game log')
+    parser.add_argument('log', nargs='?', default='game_log.bin')
+    parser.add_argument('-o', '--output', default='game_log_analysis.csv')
+    parser.add_argument('--depth', type=int, default=2, help='search depth per position')
+    parser.add_argument('--blunder', type=float, default=2.0,
+                        help='loss in pawns that flags a blunder')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    stats = analyze(args.log, args.output, args.depth, args.blunder, args.chunk_size)
+    rate = stats['moves'] / stats['seconds'] if stats['seconds'] else 0
+    print(f"games {stats['games']}  moves {stats['moves']}  blunders {stats['blunders']}  "
+          f"skipped rows {stats['skipped']}  {stats['seconds']:.2f}s ({rate:.0f} moves/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Batch position encoding and vectorized evaluation with NumPy, for offline
+analysis of many positions (e.g. every position of the game log).
+
+    python -m src.batch [game_log.bin] [--chunk-size N]
+
+A position is encoded as 64 uint8 piece indices in Board square order
+(0 empty, 1-6 white pawn..king, 7-12 black pawn..king); a batch is one
+contiguous (N, 64) array. evaluate_batch scores a whole batch with table
+lookups and row sums and gives the same numbers as evaluation.evaluate.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from .core.bitboard import COLORS, PIECE_TYPES
+from .core.evaluation import MG, EG, PHASE_WEIGHT, MAX_PHASE
+
+# INDEX[color][name]: piece index used in the encoding
+INDEX = {color: {name: 1 + c * len(PIECE_TYPES) + n for n, name in enumerate(PIECE_TYPES)}
+         for c, color in enumerate(COLORS)}
+PIECES = 1 + len(COLORS) * len(PIECE_TYPES)
+
+
+def _table(tables):
+    # (13, 64) int32 with a zero row for empty squares
+    table = np.zeros((PIECES, 64), dtype=np.int32)
+    for color in COLORS:
+        for name in PIECE_TYPES:
+            table[INDEX[color][name]] = tables[color][name]
+    return table
+
+
+MG_TABLE = _table(MG)
+EG_TABLE = _table(EG)
+PHASE_TABLE = np.array([0] + [PHASE_WEIGHT[name] for color in COLORS for name in PIECE_TYPES],
+                       dtype=np.int32)
+SQUARES = np.arange(64)
+
+
+def encode_board(board):
+    """
+    The 64 piece indices of 'board' as bytes.
+    """
+    return bytes([0 if square.piece is None else INDEX[square.piece.color][square.piece.name]
+                  for row in board.squares for square in row])
+
+
+def encode(boards):
+    """
+    (N, 64) uint8 array of the positions of 'boards' (any iterable).
+    """
+    batch = PositionBatch()
+    for board in boards:
+        batch.add(board)
+    return batch.array()
+
+
+class PositionBatch:
+    """
+    Collects positions one board at a time (e.g. while replaying games)
+    into a contiguous buffer.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, board):
+        self.data += encode_board(board)
+        self.count += 1
+
+    def array(self):
+        return np.frombuffer(bytes(self.data), dtype=np.uint8).reshape(self.count, 64)
+
+    def clear(self):
+        self.data = bytearray()
+        self.count = 0
+
+
+def planes(encoded):
+    """
+    (N, 12, 64) uint8 one-hot planes (white pawn..king, black pawn..king)
+    of an encoded batch.
+    """
+    pieces = np.arange(1, PIECES, dtype=np.uint8)
+    return (encoded[:, None, :] == pieces[None, :, None]).astype(np.uint8)
+
+
+def evaluate_batch(encoded):
+    """
+    Tapered material + piece-square score of every position of an encoded
+    batch, from white's point of view, in pawns (float64 array).
+    """
+    mg = MG_TABLE[encoded, SQUARES].sum(axis=1, dtype=np.int64)
+    eg = EG_TABLE[encoded, SQUARES].sum(axis=1, dtype=np.int64)
+    phase = np.minimum(PHASE_TABLE[encoded].sum(axis=1, dtype=np.int64), MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) / (MAX_PHASE * 100)
+
+
+def log_batches(path, chunk_size=10000):
+    """
+    Yields encoded batches of the positions after every move of a game
+    log (a .bin game store or a CSV log), replayed as in analyze_log.
+    """
+    from .analyze_log import GameReplayer, read_chunks
+
+    replayer = GameReplayer(depth=0)
+    batch = PositionBatch()
+    for chunk in read_chunks(path, chunk_size):
+        for row in chunk:
+            if replayer.feed(row) is not None:
+                batch.add(replayer.engine.board)
+        if batch:
+            yield batch.array()
+            batch.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate every position of a game log in batches')
+    parser.add_argument('log', nargs='?', default='game_log.bin')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    positions = 0
+    total = 0.0
+    start = time.perf_counter()
+    for encoded in log_batches(args.log, args.chunk_size):
+        scores = evaluate_batch(encoded)
+        positions += len(scores)
+        total += scores.sum()
+    elapsed = time.perf_counter() - start
+    mean = total / positions if positions else 0.0
+    print(f'positions {positions}  mean eval {mean:+.2f}  {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+"""
+Micro benchmarks for the engine core (see src/core/perft.py for move generation).
+
+    python -m src.bench board [--count N]
+    python -m src.bench search [--depth D] [--workers 1 2 4 ...]
+    python -m src.bench imports [--repeat N]
+    python -m src.bench fen [--count N | --epd suite.epd]
+    python -m src.bench pgn games.pgn [--replay]
+    python -m src.bench batch [--count N]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .core.board import Board
+from .core.engine import Engine
+from .core.perft import setup, POSITIONS
+from .core.fen import read_fen, read_epd, write_epd
+from .core.pgn import read_games, replay
+from .core import movecode
+
+# modules timed by bench_imports, from the bare core up to the full UI
+IMPORT_MODULES = ['src.core.engine', 'src.uciserver', 'src.main']
+# run in a fresh interpreter: import time and whether the heavy packages came along
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'pygame' in sys.modules, 'pandas' in sys.modules)
+'''
+
+
+def bench_board(count=2000):
+    """
+    Average construction time and retained memory of a start-position Board.
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        Board()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    boards = [Board() for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del boards
+
+    return {
+        'construct_us': elapsed / count * 1e6,
+        'bytes_per_board': (after - before) / count,
+    }
+
+
+def bench_search(fen, depth, workers):
+    """
+    Fixed-depth search time of 'fen' with the root split across 'workers'
+    processes (the pool is started before timing).
+    """
+    engine = setup(fen)
+    engine.workers = workers
+    if workers > 1:
+        engine.get_pool(workers)
+    start = time.perf_counter()
+    result = engine.search(max_depth=depth)
+    elapsed = time.perf_counter() - start
+    engine.close()
+    return result, elapsed
+
+
+def random_positions(count, seed=1):
+    """
+    EPD lines of 'count' positions reached by random playouts from the start.
+    """
+    rng = random.Random(seed)
+    engine = Engine()
+    lines = []
+    while len(lines) < count:
+        engine.reset()
+        for ply in range(rng.randrange(10, 80)):
+            moves = engine.legal_moves()
+            if not moves:
+                break
+            code = rng.choice(moves)
+            row, col = divmod(movecode.from_square(code), 8)
+            engine.move(engine.board.squares[row][col].piece, movecode.to_move(code))
+        lines.append(write_epd(engine.fen(), {'id': f'random.{len(lines)}',
+                                              'hmvc': engine.halfmove_clock,
+                                              'fmvn': engine.fullmove_number}))
+    return lines
+
+
+def bench_fen(lines):
+    """
+    Time to parse an EPD suite and to set up every position, in place
+    (Engine.set_fen) and through a new Board (read_fen().to_board()).
+    """
+    start = time.perf_counter()
+    records = list(read_epd(lines))
+    parsed = time.perf_counter() - start
+
+    engine = Engine()
+    start = time.perf_counter()
+    for record in records:
+        engine.set_fen(record.fen)
+    in_place = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in records:
+        read_fen(record.fen).to_board()
+    new_board = time.perf_counter() - start
+
+    # the export must give the input back
+    mismatches = 0
+    for record in records:
+        engine.set_fen(record.fen)
+        mismatches += engine.fen() != record.fen
+    return {
+        'positions': len(records),
+        'parse_us': parsed / len(records) * 1e6,
+        'set_fen_us': in_place / len(records) * 1e6,
+        'to_board_us': new_board / len(records) * 1e6,
+        'mismatches': mismatches,
+    }
+
+
+def bench_pgn(path, play=False):
+    """
+    Streams every game of the PGN file 'path' (replaying its moves on an
+    Engine if 'play'); returns throughput and peak traced memory.
+    """
+    engine = Engine()
+    games = moves = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, encoding='utf-8-sig') as f:
+        for game in read_games(f):
+            games += 1
+            if play:
+                for code in replay(engine, game):
+                    moves += 1
+            else:
+                moves += len(game.moves)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'games': games,
+        'moves': moves,
+        'seconds': elapsed,
+        'games_per_s': games / elapsed,
+        'moves_per_s': moves / elapsed,
+        'peak_kb': peak / 1024,
+    }
+
+
+def bench_batch(lines, repeat=3):
+    """
+    Positions per second of the scalar evaluation (a full piece-square scan
+    per Board, evaluation.compute_scores) against the NumPy batch path,
+    with and without encoding the boards. Boards are set up beforehand.
+    """
+    from .batch import encode, evaluate_batch
+    from .core.evaluation import compute_scores, evaluate, MAX_PHASE
+
+    boards = [read_fen(record.fen).to_board() for record in read_epd(lines)]
+
+    def best(run):
+        times = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            out = run()
+            times.append(time.perf_counter() - start)
+        return min(times), out
+
+    def scalar():
+        scores = []
+        for board in boards:
+            mg, eg, phase = compute_scores(board)
+            phase = min(phase, MAX_PHASE)
+            scores.append((mg * phase + eg * (MAX_PHASE - phase)) / (MAX_PHASE * 100))
+        return scores
+
+    scalar_s, scores = best(scalar)
+    encode_s, encoded = best(lambda: encode(boards))
+    batch_s, batch_scores = best(lambda: evaluate_batch(encoded))
+    # both paths must agree with the incrementally kept score
+    error = max(max(abs(a - evaluate(board)), abs(b - evaluate(board)))
+                for a, b, board in zip(scores, batch_scores, boards))
+    return {
+        'positions': len(boards),
+        'scalar_per_s': len(boards) / scalar_s,
+        'encode_per_s': len(boards) / encode_s,
+        'batch_per_s': len(boards) / batch_s,
+        'encoded_batch_per_s': len(boards) / (encode_s + batch_s),
+        'max_error': error,
+    }
+
+
+def bench_imports(module, repeat=5):
+    """
+    Best-of-'repeat' cold import time of 'module' (each in a new interpreter)
+    and whether it pulled in pygame / pandas.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    best = None
+    for i in range(repeat):
+        out = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT.format(module=module)],
+                             cwd=root, env=env, capture_output=True, text=True, check=True)
+        elapsed, pygame, pandas = out.stdout.split()
+        best = min(best or float(elapsed), float(elapsed))
+    return {'import_ms': best * 1000, 'pygame': pygame == 'True', 'pandas': pandas == 'True'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Engine core micro benchmarks')
+    sub = parser.add_subparsers(dest='bench', required=True)
+    board = sub.add_parser('board', help='Board construction time and memory')
+    board.add_argument('--count', type=int, default=2000)
+    search = sub.add_parser('search', help='fixed-depth search speedup per worker count')
+    search.add_argument('--depth', type=int, default=3)
+    search.add_argument('--position', choices=[p[0] for p in POSITIONS], default='kiwipete')
+    search.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    imports = sub.add_parser('imports', help='cold import time of the engine core vs the UI')
+    imports.add_argument('--repeat', type=int, default=5)
+    fen = sub.add_parser('fen', help='EPD parsing and position setup speed')
+    fen.add_argument('--count', type=int, default=2000, help='random positions to generate')
+    fen.add_argument('--epd', help='use this EPD suite instead')
+    pgn = sub.add_parser('pgn', help='streaming PGN parsing (and replay) throughput')
+    pgn.add_argument('path')
+    pgn.add_argument('--replay', action='store_true', help='also play every move on a board')
+    batch = sub.add_parser('batch', help='scalar vs NumPy batch evaluation throughput')
+    batch.add_argument('--count', type=int, default=2000, help='random positions to generate')
+    args = parser.parse_args()
+
+    if args.bench == 'board':
+        result = bench_board(args.count)
+        print(f"construction  {result['construct_us']:8.1f} us/board")
+        print(f"memory        {result['bytes_per_board']:8.0f} bytes/board")
+
+    elif args.bench == 'search':
+        fen = {name: fen for name, fen, expected in POSITIONS}[args.position]
+        base = None
+        for workers in args.workers:
+            result, elapsed = bench_search(fen, args.depth, workers)
+            base = base or elapsed
+            print(f'workers {workers:>2}  {elapsed:7.2f}s  speedup {base / elapsed:5.2f}x  '
+                  f'nodes {result.nodes:>8}  {result}')
+
+    elif args.bench == 'imports':
+        for module in IMPORT_MODULES:
+            result = bench_imports(module, args.repeat)
+            print(f"{module:<18} {result['import_ms']:8.1f} ms  "
+                  f"pygame {'yes' if result['pygame'] else 'no':<3}  "
+                  f"pandas {'yes' if result['pandas'] else 'no'}")
+
+    elif args.bench == 'fen':
+        if args.epd:
+            with open(args.epd) as f:
+                lines = f.readlines()
+        else:
+            lines = random_positions(args.count)
+        result = bench_fen(lines)
+        print(f"positions     {result['positions']:8}")
+        print(f"epd parse     {result['parse_us']:8.1f} us/position")
+        print(f"set_fen       {result['set_fen_us']:8.1f} us/position (in place)")
+        print(f"to_board      {result['to_board_us']:8.1f} us/position (new Board)")
+        print(f"round trip    {result['mismatches']:8} mismatches")
+
+    elif args.bench == 'pgn':
+        result = bench_pgn(args.path, args.replay)
+        print(f"{result['games']} games, {result['moves']} moves in {result['seconds']:.2f}s  "
+              f"({result['games_per_s']:.0f} games/s, {result['moves_per_s']:.0f} moves/s, "
+              f"peak {result['peak_kb']:.0f} KiB)")
+
+    elif args.bench == 'batch':
+        result = bench_batch(random_positions(args.count))
+        print(f"positions     {result['positions']:8}")
+        print(f"scalar        {result['scalar_per_s']:10.0f} positions/s (piece-square scan per board)")
+        print(f"encode        {result['encode_per_s']:10.0f} positions/s (boards to uint8 array)")
+        print(f"batch eval    {result['batch_per_s']:10.0f} positions/s (encoded array)")
+        print(f"encode+eval   {result['encoded_batch_per_s']:10.0f} positions/s")
+        print(f"max error     {result['max_error']:10.2g} pawns")
+
+
+if __name__ == '__main__':
+    main()
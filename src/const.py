@@ -1,7 +1,8 @@
+from .core.const import *
+
 #screen dimensions
 WIDTH=600
 HEIGHT=600
-#board dimensions
-ROWS=8
-COLS=8
 SQSIZE=WIDTH//COLS
+#frame rate cap
+FPS=60
@@ -0,0 +1,6 @@
+"""
+Rules, move generation and search, with no dependencies outside the
+standard library (no pygame, no pandas). The pygame UI in src/ builds on
+this package; headless users (src.uciserver, src.analyze_log, benchmarks)
+import it directly.
+"""
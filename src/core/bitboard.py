@@ -0,0 +1,402 @@
+"""
+Bitboards: one 64-bit int per (color, piece type), bit n = square n.
+
+Square index = row * 8 + col, so a8 is 0 and h1 is 63 (same layout as
+Board.squares). Attacks come from tables built once at import (knight,
+king, pawn) and from ray tables for the sliders: a ray is cut at its first
+blocker with one lsb / msb. Board keeps its own masks up to date and
+Engine generates moves (pseudo_moves) and answers attack queries
+(attacked) with them; the Bitboards class is the standalone position
+format used for FEN parsing and for shipping positions to other processes.
+"""
+from .const import *
+from .pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from .movecode import CAPTURE, DOUBLE_PUSH, EN_PASSANT, CASTLING
+
+COLORS = ('white', 'black')
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PIECE_CLASSES = {
+    'pawn': Pawn, 'knight': Knight, 'bishop': Bishop,
+    'rook': Rook, 'queen': Queen, 'king': King,
+}
+
+FULL = (1 << 64) - 1
+
+# castling right bits
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+# ray directions as (row_incr, col_incr)
+BISHOP_DIRS = [(-1, 1), (-1, -1), (1, 1), (1, -1)]
+ROOK_DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def square_index(row, col):
+    return row * COLS + col
+
+
+def lsb(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+def msb(mask):
+    return mask.bit_length() - 1
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _jump_table(offsets):
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, COLS)
+        mask = 0
+        for row_incr, col_incr in offsets:
+            r, c = row + row_incr, col + col_incr
+            if 0 <= r < ROWS and 0 <= c < COLS:
+                mask |= 1 << square_index(r, c)
+        table.append(mask)
+    return table
+
+
+def _ray_table(direction):
+    row_incr, col_incr = direction
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, COLS)
+        mask = 0
+        r, c = row + row_incr, col + col_incr
+        while 0 <= r < ROWS and 0 <= c < COLS:
+            mask |= 1 << square_index(r, c)
+            r, c = r + row_incr, c + col_incr
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _jump_table([
+    (-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)])
+KING_ATTACKS = _jump_table([
+    (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)])
+# squares attacked by a pawn of the given color standing on sq
+PAWN_ATTACKS = {
+    'white': _jump_table([(-1, -1), (-1, 1)]),
+    'black': _jump_table([(1, -1), (1, 1)]),
+}
+RAYS = {direction: _ray_table(direction) for direction in BISHOP_DIRS + ROOK_DIRS}
+
+
+# (ray table, True if the ray runs towards higher indices) per direction;
+# those rays hit their lowest set bit first
+BISHOP_RAYS = [(RAYS[(r, c)], r * COLS + c > 0) for r, c in BISHOP_DIRS]
+ROOK_RAYS = [(RAYS[(r, c)], r * COLS + c > 0) for r, c in ROOK_DIRS]
+
+
+def _slider_attacks(sq, occupied, rays):
+    attacks = 0
+    for table, forward in rays:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            if forward:
+                ray ^= table[(blockers & -blockers).bit_length() - 1]
+            else:
+                ray ^= table[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def bishop_attacks(sq, occupied):
+    return _slider_attacks(sq, occupied, BISHOP_RAYS)
+
+
+def rook_attacks(sq, occupied):
+    return _slider_attacks(sq, occupied, ROOK_RAYS)
+
+
+def queen_attacks(sq, occupied):
+    return _slider_attacks(sq, occupied, BISHOP_RAYS) | _slider_attacks(sq, occupied, ROOK_RAYS)
+
+
+def attacked(pieces, occupied, sq, by_color, captured=0):
+    """
+    True if a 'by_color' piece attacks square 'sq'. 'pieces' is a
+    {color: {name: mask}} dict (Board.bitboards or Bitboards.pieces);
+    pieces on the 'captured' squares are left out. Looks outward from the
+    square with the attack tables.
+    """
+    enemy = pieces[by_color]
+    keep = ~captured
+    # pawns attack towards the side they move, so look the other way
+    if PAWN_ATTACKS['black' if by_color == 'white' else 'white'][sq] & enemy['pawn'] & keep:
+        return True
+    if KNIGHT_ATTACKS[sq] & enemy['knight'] & keep:
+        return True
+    if KING_ATTACKS[sq] & enemy['king']:
+        return True
+    queens = enemy['queen']
+    diagonal = (enemy['bishop'] | queens) & keep
+    if diagonal and _slider_attacks(sq, occupied, BISHOP_RAYS) & diagonal:
+        return True
+    straight = (enemy['rook'] | queens) & keep
+    if straight and _slider_attacks(sq, occupied, ROOK_RAYS) & straight:
+        return True
+    return False
+
+
+def exposes_king(pieces, occupancy, code, color):
+    """
+    True if move 'code' by 'color' would leave its own king attacked.
+    Works on the masks alone: the position after the move is never built.
+    """
+    from_bit = 1 << (code & 0x3F)
+    to_sq = code >> 6 & 0x3F
+    to_bit = 1 << to_sq
+    enemy = 'black' if color == 'white' else 'white'
+    mine = pieces[color]
+    their = occupancy[enemy]
+    occupied = (occupancy[color] | their) & ~from_bit | to_bit
+    captured = to_bit & their
+
+    king = mine['king']
+    if king & from_bit:
+        king_sq = to_sq
+        # castling: the rook lands between the king's squares
+        if abs((code & 7) - (to_sq & 7)) == 2:
+            row = to_sq & ~7
+            rook_from, rook_to = (row, row + 3) if to_sq & 7 == 2 else (row + 7, row + 5)
+            occupied = occupied & ~(1 << rook_from) | 1 << rook_to
+    else:
+        king_sq = (king & -king).bit_length() - 1
+        # en passant: a pawn moving diagonally to an empty square takes the
+        # pawn beside it
+        if mine['pawn'] & from_bit and not captured and (code ^ to_sq) & 7:
+            taken = 1 << ((code & 0x38) | (to_sq & 7))
+            occupied &= ~taken
+            captured = taken
+    if not king:
+        return False
+    return attacked(pieces, occupied, king_sq, enemy, captured)
+
+
+# move code parts
+CAPTURE_BITS = CAPTURE << 12
+# movecode.PROMOTIONS indices of queen, rook, bishop, knight
+PROMOTION_BITS = [index << 16 for index in (1, 2, 3, 4)]
+# (castling right, king square, king destination, squares that must be empty)
+CASTLES = {
+    'white': ((WHITE_KINGSIDE, 60, 62, 0b11 << 61), (WHITE_QUEENSIDE, 60, 58, 0b111 << 57)),
+    'black': ((BLACK_KINGSIDE, 4, 6, 0b11 << 5), (BLACK_QUEENSIDE, 4, 2, 0b111 << 1)),
+}
+RANK_1 = 0xFF << 56
+RANK_8 = 0xFF
+
+
+def _add_moves(moves, sq, targets, their):
+    while targets:
+        bit = targets & -targets
+        targets ^= bit
+        code = sq | (bit.bit_length() - 1) << 6
+        moves.append(code | CAPTURE_BITS if bit & their else code)
+
+
+def _add_pawn_moves(moves, code, promoting):
+    if promoting:
+        for bits in PROMOTION_BITS:
+            moves.append(code | bits)
+    else:
+        moves.append(code)
+
+
+def pseudo_moves(pieces, occupancy, color, castling=0, ep_square=None, captures_only=False):
+    """
+    Pseudo-legal move codes for 'color' from the masks of a position
+    ('occupancy' is {color: mask of all its pieces}). Castling only needs
+    the right and empty squares between king and rook; whether the king
+    passes through an attacked square is left to the caller, as is king
+    safety in general. With captures_only, just captures (en passant and
+    capture promotions included).
+    """
+    enemy = 'black' if color == 'white' else 'white'
+    mine = pieces[color]
+    own = occupancy[color]
+    their = occupancy[enemy]
+    occupied = own | their
+    targets = their if captures_only else ~own & FULL
+    moves = []
+
+    for sq in iter_bits(mine['knight']):
+        _add_moves(moves, sq, KNIGHT_ATTACKS[sq] & targets, their)
+    for sq in iter_bits(mine['bishop'] | mine['queen']):
+        _add_moves(moves, sq, _slider_attacks(sq, occupied, BISHOP_RAYS) & targets, their)
+    for sq in iter_bits(mine['rook'] | mine['queen']):
+        _add_moves(moves, sq, _slider_attacks(sq, occupied, ROOK_RAYS) & targets, their)
+    for sq in iter_bits(mine['king']):
+        _add_moves(moves, sq, KING_ATTACKS[sq] & targets, their)
+
+    # pawns: whole-set shifts for pushes, attack table for captures
+    pawns = mine['pawn']
+    empty = ~occupied & FULL
+    if color == 'white':
+        step, last_rank, start_rank = -8, RANK_8, 0xFF << 48
+    else:
+        step, last_rank, start_rank = 8, RANK_1, 0xFF << 8
+    if not captures_only:
+        if step < 0:
+            single = pawns >> 8 & empty
+            double = ((pawns & start_rank) >> 8 & empty) >> 8 & empty
+        else:
+            single = pawns << 8 & empty
+            double = ((pawns & start_rank) << 8 & empty) << 8 & empty
+        for to in iter_bits(single):
+            _add_pawn_moves(moves, (to - step) | to << 6, (1 << to) & last_rank)
+        for to in iter_bits(double):
+            moves.append((to - 2 * step) | to << 6 | DOUBLE_PUSH << 12)
+    ep_bit = 1 << ep_square if ep_square is not None else 0
+    attacks = PAWN_ATTACKS[color]
+    for sq in iter_bits(pawns):
+        hits = attacks[sq] & (their | ep_bit)
+        while hits:
+            bit = hits & -hits
+            hits ^= bit
+            code = sq | (bit.bit_length() - 1) << 6 | CAPTURE_BITS
+            if bit == ep_bit:
+                moves.append(code | EN_PASSANT << 12)
+            else:
+                _add_pawn_moves(moves, code, bit & last_rank)
+
+    if castling and not captures_only:
+        for right, king_sq, to, between in CASTLES[color]:
+            if castling & right and not occupied & between:
+                moves.append(king_sq | to << 6 | CASTLING << 12)
+    return moves
+
+
+class Bitboards:
+    """
+    Bitboard view of a position: one 64-bit integer per (color, piece type)
+    plus castling rights, en passant target and side to move.
+    Convert with from_board / to_board.
+    """
+
+    def __init__(self):
+        self.pieces = {color: {name: 0 for name in PIECE_TYPES} for color in COLORS}
+        self.next_player = 'white'
+        self.castling = 0
+        self.ep_square = None
+
+    # conversion
+
+    @classmethod
+    def from_board(cls, board, next_player='white'):
+        bbs = cls()
+        bbs.next_player = next_player
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board.squares[row][col].piece
+                if piece is not None:
+                    bbs.pieces[piece.color][piece.name] |= 1 << square_index(row, col)
+
+        bbs.castling = board.castling_rights
+
+        # en passant target is the square the flagged pawn skipped over
+        pawn = board.ep_pawn
+        if pawn is not None:
+            for row in (3, 4):
+                for col in range(COLS):
+                    if board.squares[row][col].piece is pawn:
+                        bbs.ep_square = square_index(row - pawn.dir, col)
+        return bbs
+
+    def to_board(self):
+        from .board import Board
+
+        board = Board()
+        placement = [(sq, color, name)
+                     for color in COLORS for name in PIECE_TYPES
+                     for sq in iter_bits(self.pieces[color][name])]
+        board.set_position(placement, self.castling, self.ep_square, self.next_player)
+        return board
+
+    def pack(self):
+        """
+        Flat tuple of ints/strings, cheap to pickle (e.g. to worker processes).
+        """
+        return tuple(self.pieces[color][name] for color in COLORS for name in PIECE_TYPES) \
+            + (self.castling, self.ep_square, self.next_player)
+
+    @classmethod
+    def unpack(cls, packed):
+        bbs = cls()
+        idx = 0
+        for color in COLORS:
+            for name in PIECE_TYPES:
+                bbs.pieces[color][name] = packed[idx]
+                idx += 1
+        bbs.castling, bbs.ep_square, bbs.next_player = packed[idx:]
+        return bbs
+
+    # occupancy
+
+    def occupancy(self, color):
+        mask = 0
+        for bb in self.pieces[color].values():
+            mask |= bb
+        return mask
+
+    def occupied(self):
+        return self.occupancy('white') | self.occupancy('black')
+
+    def piece_at(self, sq):
+        bit = 1 << sq
+        for color in COLORS:
+            for name, bb in self.pieces[color].items():
+                if bb & bit:
+                    return color, name
+        return None
+
+    # attack queries
+
+    def attacks_from(self, color, name, sq, occupied):
+        if name == 'pawn':
+            return PAWN_ATTACKS[color][sq]
+        if name == 'knight':
+            return KNIGHT_ATTACKS[sq]
+        if name == 'bishop':
+            return bishop_attacks(sq, occupied)
+        if name == 'rook':
+            return rook_attacks(sq, occupied)
+        if name == 'queen':
+            return queen_attacks(sq, occupied)
+        return KING_ATTACKS[sq]
+
+    def attacks(self, color):
+        occupied = self.occupied()
+        mask = 0
+        for name, bb in self.pieces[color].items():
+            for sq in iter_bits(bb):
+                mask |= self.attacks_from(color, name, sq, occupied)
+        return mask
+
+    def is_attacked(self, sq, by_color):
+        return attacked(self.pieces, self.occupied(), sq, by_color)
+
+    def in_check(self, color):
+        king = self.pieces[color]['king']
+        enemy = 'black' if color == 'white' else 'white'
+        return bool(king) and self.is_attacked(lsb(king), enemy)
+
+    # move generation
+
+    def pseudo_moves(self, color=None):
+        """
+        Pseudo-legal move codes for 'color' (default: side to move).
+        """
+        occupancy = {c: self.occupancy(c) for c in COLORS}
+        return pseudo_moves(self.pieces, occupancy, color or self.next_player,
+                            self.castling, self.ep_square)
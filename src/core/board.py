@@ -0,0 +1,430 @@
+from .const import *
+from .square import Square
+from .pieces import * 
+from .move import Move
+from .undo import Undo
+from . import movecode
+from .bitboard import square_index, PIECE_CLASSES, COLORS, PIECE_TYPES, \
+    WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+from . import zobrist
+from .evaluation import MG, EG, PHASE_WEIGHT, compute_scores
+from .fen import parse_fen, board_fen
+
+PROMOTION_CLASSES = {'queen': Queen, 'rook': Rook, 'bishop': Bishop, 'knight': Knight}
+
+class Board:
+
+    def __init__(self):
+        self.squares = [[0, 0, 0, 0, 0, 0, 0, 0] for col in range(COLS)]
+        self.last_code = None
+        # pawn that can currently be captured en passant, and the square
+        # it skipped (the en passant target)
+        self.ep_pawn = None
+        self.ep_square = None
+        # bitboards[color][name]: mask of the squares holding those pieces,
+        # occupancy[color]: all of that color's pieces; kept up to date by
+        # make_code / unmake_move for move generation and attack checks
+        self.bitboards = {color: dict.fromkeys(PIECE_TYPES, 0) for color in COLORS}
+        self.occupancy = dict.fromkeys(COLORS, 0)
+        # (row, col) of each king, kept up to date by make_move / unmake_move
+        self.kings = {'white': None, 'black': None}
+        # castling right bits, zobrist key of the en passant file (0 if none)
+        # and zobrist key of the position, all updated incrementally
+        self.castling_rights = 0
+        self.ep_key = 0
+        self.hash = 0
+        # middlegame / endgame material + piece-square sums (white minus
+        # black, centipawns) and game phase, also updated incrementally
+        # (see evaluation.py)
+        self.mg = 0
+        self.eg = 0
+        self.phase = 0
+        # the 64 squares are created once and reused by reset / clear
+        self._create()
+        self.reset()
+
+    def move(self, piece, move):
+        return self.make_move(piece, move)
+
+    def make_move(self, piece, move):
+        """
+        Plays a Move object; see make_code.
+        """
+        return self.make_code(movecode.from_move(move))
+
+    def make_code(self, code):
+        """
+        Plays the move 'code' in place (no copying) and returns an Undo record
+        holding everything unmake_move needs to restore the position.
+        Captures, en passant and castling are read off the board, so codes
+        built without flags (movecode.from_move) work too.
+        """
+        from_idx = code & 0x3F
+        to_idx = code >> 6 & 0x3F
+        initial_row, initial_col = divmod(from_idx, COLS)
+        final_row, final_col = divmod(to_idx, COLS)
+        initial_sqr = self.squares[initial_row][initial_col]
+        final_sqr = self.squares[final_row][final_col]
+        piece = initial_sqr.piece
+
+        undo = Undo(piece, code, self.last_code, piece.moved)
+        undo.hash = self.hash
+        undo.castling_rights = self.castling_rights
+        undo.ep_key = self.ep_key
+        undo.mg = mg = self.mg
+        undo.eg = eg = self.eg
+        undo.phase = self.phase
+        undo.ep_square = self.ep_square
+
+        color = piece.color
+        bitboards = self.bitboards
+        occupancy = self.occupancy
+        from_bit = 1 << from_idx
+        to_bit = 1 << to_idx
+        bitboards[color][piece.name] ^= from_bit
+        occupancy[color] ^= from_bit | to_bit
+
+        keys = zobrist.PIECE_KEYS
+        h = self.hash ^ zobrist.SIDE_KEY ^ keys[piece.color][piece.name][from_idx]
+        mg -= MG[piece.color][piece.name][from_idx]
+        eg -= EG[piece.color][piece.name][from_idx]
+
+        # normal capture
+        captured = final_sqr.piece
+        if captured is not None:
+            undo.captured = captured
+            undo.captured_square = final_sqr
+            bitboards[captured.color][captured.name] ^= to_bit
+            occupancy[captured.color] ^= to_bit
+            h ^= keys[captured.color][captured.name][to_idx]
+            mg -= MG[captured.color][captured.name][to_idx]
+            eg -= EG[captured.color][captured.name][to_idx]
+            self.phase -= PHASE_WEIGHT[captured.name]
+
+        # console board move update
+        initial_sqr.piece = None
+        final_sqr.piece = piece
+
+        if isinstance(piece, Pawn):
+            # en passant capture
+            if final_col != initial_col and captured is None:
+                ep_sqr = self.squares[initial_row][final_col]
+                undo.captured = ep_sqr.piece
+                undo.captured_square = ep_sqr
+                undo.en_passant_capture = True
+                ep_sqr.piece = None
+                ep_idx = initial_row * COLS + final_col
+                bitboards[undo.captured.color]['pawn'] ^= 1 << ep_idx
+                occupancy[undo.captured.color] ^= 1 << ep_idx
+                h ^= keys[undo.captured.color]['pawn'][ep_idx]
+                mg -= MG[undo.captured.color]['pawn'][ep_idx]
+                eg -= EG[undo.captured.color]['pawn'][ep_idx]
+
+            # pawn promotion
+            elif final_row == 0 or final_row == 7:
+                undo.promoted = self.check_promotion(piece, final_sqr, movecode.promotion(code))
+                self.phase += PHASE_WEIGHT[undo.promoted.name]
+
+        placed = undo.promoted or piece
+        bitboards[color][placed.name] ^= to_bit
+        h ^= keys[placed.color][placed.name][to_idx]
+        mg += MG[placed.color][placed.name][to_idx]
+        eg += EG[placed.color][placed.name][to_idx]
+
+        # king castling
+        if isinstance(piece, King):
+            self.kings[piece.color] = (final_row, final_col)
+            if abs(final_col - initial_col) == 2:
+                rook_col, rook_final_col = (0, 3) if final_col < initial_col else (7, 5)
+                rook_sqr = self.squares[initial_row][rook_col]
+                rook_final_sqr = self.squares[initial_row][rook_final_col]
+                undo.rook = rook_sqr.piece
+                undo.rook_initial = rook_sqr
+                undo.rook_final = rook_final_sqr
+                undo.rook_moved = undo.rook.moved
+                rook_final_sqr.piece = undo.rook
+                rook_sqr.piece = None
+                undo.rook.moved = True
+                rook_bits = 1 << initial_row * COLS + rook_col | 1 << initial_row * COLS + rook_final_col
+                bitboards[color]['rook'] ^= rook_bits
+                occupancy[color] ^= rook_bits
+                rook_keys = keys[undo.rook.color]['rook']
+                h ^= rook_keys[initial_row * COLS + rook_col]
+                h ^= rook_keys[initial_row * COLS + rook_final_col]
+                rook_mg = MG[undo.rook.color]['rook']
+                rook_eg = EG[undo.rook.color]['rook']
+                mg += rook_mg[initial_row * COLS + rook_final_col] - rook_mg[initial_row * COLS + rook_col]
+                eg += rook_eg[initial_row * COLS + rook_final_col] - rook_eg[initial_row * COLS + rook_col]
+
+        # castling rights
+        rights = self.castling_rights & zobrist.CASTLING_MASK[from_idx] & zobrist.CASTLING_MASK[to_idx]
+        h ^= zobrist.CASTLING_KEYS[self.castling_rights] ^ zobrist.CASTLING_KEYS[rights]
+        self.castling_rights = rights
+
+        # en passant flags: only a pawn that just moved two squares
+        # can be captured en passant
+        undo.ep_pawn = self.ep_pawn
+        if self.ep_pawn is not None:
+            self.ep_pawn.en_passant = False
+            self.ep_pawn = None
+        h ^= self.ep_key
+        self.ep_key = 0
+        self.ep_square = None
+        if isinstance(piece, Pawn) and abs(final_row - initial_row) == 2:
+            piece.en_passant = True
+            self.ep_pawn = piece
+            self.ep_square = (initial_row + final_row) // 2 * COLS + final_col
+            self.ep_key = zobrist.EP_KEYS[final_col]
+            h ^= self.ep_key
+
+        self.hash = h
+        self.mg = mg
+        self.eg = eg
+
+        # move
+        piece.moved = True
+
+        # set last move
+        self.last_code = code
+
+        return undo
+
+    def unmake_move(self, undo):
+        """
+        Takes back the move recorded in 'undo' (as returned by make_code).
+        """
+        piece = undo.piece
+        code = undo.code
+
+        # en passant flags
+        if self.ep_pawn is not None:
+            self.ep_pawn.en_passant = False
+        self.ep_pawn = undo.ep_pawn
+        if undo.ep_pawn is not None:
+            undo.ep_pawn.en_passant = True
+
+        color = piece.color
+        bitboards = self.bitboards
+        occupancy = self.occupancy
+
+        # castling rook
+        if undo.rook is not None:
+            rook_initial, rook_final = undo.rook_initial, undo.rook_final
+            rook_initial.piece = undo.rook
+            rook_final.piece = None
+            undo.rook.moved = undo.rook_moved
+            rook_bits = 1 << rook_initial.row * COLS + rook_initial.col \
+                | 1 << rook_final.row * COLS + rook_final.col
+            bitboards[color]['rook'] ^= rook_bits
+            occupancy[color] ^= rook_bits
+
+        # piece back to its square (this also drops any promoted piece)
+        from_idx = code & 0x3F
+        to_idx = code >> 6 & 0x3F
+        initial_row, initial_col = divmod(from_idx, COLS)
+        self.squares[to_idx >> 3][to_idx & 7].piece = None
+        self.squares[initial_row][initial_col].piece = piece
+        from_bit = 1 << from_idx
+        to_bit = 1 << to_idx
+        bitboards[color][(undo.promoted or piece).name] ^= to_bit
+        bitboards[color][piece.name] ^= from_bit
+        occupancy[color] ^= from_bit | to_bit
+
+        # captured piece
+        captured = undo.captured
+        if captured is not None:
+            square = undo.captured_square
+            square.piece = captured
+            bit = 1 << square.row * COLS + square.col
+            bitboards[captured.color][captured.name] ^= bit
+            occupancy[captured.color] ^= bit
+
+        if isinstance(piece, King):
+            self.kings[piece.color] = (initial_row, initial_col)
+
+        piece.moved = undo.moved
+        self.last_code = undo.last_code
+        self.hash = undo.hash
+        self.castling_rights = undo.castling_rights
+        self.ep_key = undo.ep_key
+        self.ep_square = undo.ep_square
+        self.mg = undo.mg
+        self.eg = undo.eg
+        self.phase = undo.phase
+
+    @property
+    def last_move(self):
+        # Move object for the UI, built on demand
+        if self.last_code is None:
+            return None
+        return movecode.to_move(self.last_code)
+
+    def check_promotion(self, piece, final, promotion=None):
+        if final.row == 0 or final.row == 7:
+            promoted = PROMOTION_CLASSES[promotion or 'queen'](piece.color)
+            promoted.moved = True
+            self.squares[final.row][final.col].piece = promoted
+            return promoted
+        return None
+
+    def reset(self):
+        # back to the start position, reusing the existing squares
+        self.clear()
+        self._add_pieces('white')
+        self._add_pieces('black')
+        self.compute_hash()
+
+    def set_fen(self, fen):
+        """
+        Sets up the position of 'fen' in place and returns
+        (next_player, halfmove, fullmove). Raises ValueError on a bad FEN.
+        """
+        placement, next_player, castling, ep_square, halfmove, fullmove = parse_fen(fen)
+        self.set_position(placement, castling, ep_square, next_player)
+        return next_player, halfmove, fullmove
+
+    def fen(self, next_player='white', halfmove=0, fullmove=1):
+        return board_fen(self, next_player, halfmove, fullmove)
+
+    def set_position(self, placement, castling=0, ep_square=None, next_player='white'):
+        """
+        Replaces the position with 'placement', a list of (square, color, name).
+        Castling rights become moved flags of kings / corner rooks and the en
+        passant target flags the pawn that skipped it.
+        """
+        self.clear()
+        squares = self.squares
+        for sq, color, name in placement:
+            row, col = divmod(sq, COLS)
+            piece = PIECE_CLASSES[name](color)
+            if name == 'pawn':
+                piece.moved = row != (6 if color == 'white' else 1)
+            elif name == 'king' or name == 'rook':
+                piece.moved = True
+                if name == 'king':
+                    self.kings[color] = (row, col)
+            squares[row][col].piece = piece
+
+        # castling rights back to moved flags
+        for color, row, kingside, queenside in (('white', 7, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                ('black', 0, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            for rook_col, right in ((7, kingside), (0, queenside)):
+                if castling & right:
+                    king = squares[row][4].piece
+                    rook = squares[row][rook_col].piece
+                    if not (isinstance(king, King) and king.color == color
+                            and isinstance(rook, Rook) and rook.color == color):
+                        raise ValueError('castling right without king and rook in place')
+                    king.moved = False
+                    rook.moved = False
+
+        # the target must be behind a pawn of the side that just moved (rank 6
+        # with white to move, rank 3 with black to move); a target without
+        # the pawn that skipped it is ignored
+        if ep_square is not None:
+            row, col = divmod(ep_square, COLS)
+            if row != (2 if next_player == 'white' else 5):
+                raise ValueError('en passant target on the wrong rank for the side to move')
+            pawn_row = 4 if row == 5 else 3
+            pawn = squares[pawn_row][col].piece
+            if isinstance(pawn, Pawn) and pawn.color == ('white' if row == 5 else 'black'):
+                pawn.en_passant = True
+                self.ep_pawn = pawn
+                self.ep_square = ep_square
+
+        self.compute_hash(next_player)
+
+    def clear(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                self.squares[row][col].piece = None
+        self.last_code = None
+        self.ep_pawn = None
+        self.ep_square = None
+        self.kings = {'white': None, 'black': None}
+        self.castling_rights = 0
+        self.ep_key = 0
+        self.hash = 0
+        self.mg = 0
+        self.eg = 0
+        self.phase = 0
+
+    def compute_castling_rights(self):
+        # castling rights from the moved flags of kings and corner rooks
+        rights = 0
+        for color, row, kingside, queenside in (('white', 7, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                ('black', 0, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = self.squares[row][4].piece
+            if not (isinstance(king, King) and king.color == color and not king.moved):
+                continue
+            for rook_col, right in ((7, kingside), (0, queenside)):
+                rook = self.squares[row][rook_col].piece
+                if isinstance(rook, Rook) and rook.color == color and not rook.moved:
+                    rights |= right
+        return rights
+
+    def compute_hash(self, next_player='white'):
+        """
+        Recomputes castling rights, en passant key, the bitboards, the
+        zobrist key and the evaluation sums from scratch. Call after setting
+        up a position by hand.
+        """
+        self.compute_bitboards()
+        self.castling_rights = self.compute_castling_rights()
+        self.ep_key = 0
+        if self.ep_pawn is not None:
+            for row in range(ROWS):
+                for col in range(COLS):
+                    if self.squares[row][col].piece is self.ep_pawn:
+                        self.ep_key = zobrist.EP_KEYS[col]
+        self.hash = zobrist.compute_hash(self, next_player)
+        # the evaluation sums are rebuilt along with the key
+        self.mg, self.eg, self.phase = compute_scores(self)
+        return self.hash
+
+    def compute_bitboards(self):
+        bitboards = {color: dict.fromkeys(PIECE_TYPES, 0) for color in COLORS}
+        occupancy = dict.fromkeys(COLORS, 0)
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.squares[row][col].piece
+                if piece is not None:
+                    bit = 1 << row * COLS + col
+                    bitboards[piece.color][piece.name] |= bit
+                    occupancy[piece.color] |= bit
+        self.bitboards = bitboards
+        self.occupancy = occupancy
+
+    # Note: calc_moves logic removed as it is now in pieces.py and orchestrated by Engine
+
+    def _create(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                self.squares[row][col] = Square(row, col)
+
+    def _add_pieces(self, color):
+        row_pawn, row_other = (6, 7) if color == 'white' else (1, 0)
+        squares = self.squares
+
+        # pawns
+        for col in range(COLS):
+            squares[row_pawn][col].piece = Pawn(color)
+
+        # knights
+        squares[row_other][1].piece = Knight(color)
+        squares[row_other][6].piece = Knight(color)
+
+        # bishops
+        squares[row_other][2].piece = Bishop(color)
+        squares[row_other][5].piece = Bishop(color)
+
+        # rooks
+        squares[row_other][0].piece = Rook(color)
+        squares[row_other][7].piece = Rook(color)
+
+        # queen
+        squares[row_other][3].piece = Queen(color)
+
+        # king
+        squares[row_other][4].piece = King(color)
+        self.kings[color] = (row_other, 4)
@@ -0,0 +1,3 @@
+#board dimensions
+ROWS=8
+COLS=8
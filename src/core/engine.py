@@ -0,0 +1,380 @@
+import datetime
+import time
+from .const import *
+from .board import Board
+from .pieces import Piece, Pawn, King, Queen, Rook, Bishop, Knight, NO_MOVES
+from .bitboard import pseudo_moves, attacked, exposes_king
+from .search import Search, SearchResult
+from .san import san
+from .fen import START_FEN
+from .history import PositionHistory
+from . import movecode
+from . import parallel
+from . import evaluation
+from .transposition import TranspositionTable
+
+CAPTURE_FLAG = movecode.CAPTURE << 12
+CASTLING_FLAG = movecode.CASTLING << 12
+
+class Engine:
+    def __init__(self, tt_size_mb=16, workers=1):
+        self.board = Board()
+        self.next_player = 'white'
+        self.hovered_sqr = None
+        self.move_log = []
+        self.game_active = True
+        # set when the game ends (see end_game)
+        self.result = '*'
+        self.end_reason = None
+        self.start_time = datetime.datetime.now()
+        # legal moves of the side to move by origin square, built once per
+        # position by update_move_table (see there)
+        self.move_table = {}
+        self.move_keys = set()
+        self.move_table_key = None
+        self.table_pending = []
+        # position keys of every ply played since the game started, with
+        # the halfmove clock (plies since the last capture or pawn move)
+        self.history = PositionHistory(self.board.hash)
+        # FEN move number (incremented after black moves)
+        self.fullmove_number = 1
+        # position the game started from (for PGN export)
+        self.start_fen = START_FEN
+        # search results shared between searches, capped at tt_size_mb
+        self.tt = TranspositionTable(tt_size_mb)
+        self.tt_size_mb = tt_size_mb
+        # search processes (root moves are split between them when > 1)
+        self.workers = workers
+        self.pool = None
+        self.pool_workers = 0
+        # Polyglot opening book consulted by search() (see open_book)
+        self.book = None
+        # callables run after every move played through move(), as
+        # listener(piece, move, undo); the UI hooks sounds in here
+        self.move_listeners = []
+        
+    def reset(self):
+        # new game on the same board (its squares are reused)
+        self.board.reset()
+        self.next_player = 'white'
+        self.hovered_sqr = None
+        self.move_log = []
+        self.new_game()
+        self.history.reset(self.board.hash)
+        self.fullmove_number = 1
+        self.start_fen = START_FEN
+
+    def set_fen(self, fen):
+        """
+        New game from the position of 'fen' (same board, set up in place).
+        """
+        next_player, halfmove, fullmove = self.board.set_fen(fen)
+        self.next_player = next_player
+        self.history.reset(self.board.hash, halfmove)
+        self.fullmove_number = fullmove
+        self.start_fen = fen
+        self.hovered_sqr = None
+        self.move_log = []
+        self.new_game()
+
+    def new_game(self):
+        self.game_active = True
+        self.result = '*'
+        self.end_reason = None
+        self.start_time = datetime.datetime.now()
+        self.move_table_key = None
+
+    @property
+    def halfmove_clock(self):
+        return self.history.halfmove_clock
+
+    def fen(self):
+        return self.board.fen(self.next_player, self.halfmove_clock, self.fullmove_number)
+
+    def next_turn(self):
+        self.next_player = 'white' if self.next_player == 'black' else 'black'
+
+    def valid_move(self, piece, move):
+        self.update_move_table()
+        return movecode.key(movecode.from_move(move)) in self.move_keys
+
+
+    def move(self, piece, move):
+        if not self.game_active: return
+        # SAN needs the position before the move
+        notation = self.get_notation(piece, move)
+        undo = self.board.move(piece, move)
+        self.log_move(piece, move, notation)
+        self.played(undo)
+        for listener in self.move_listeners:
+            listener(piece, move, undo)
+
+    def make_code(self, code):
+        """
+        Plays move code 'code' as a game move without the UI bookkeeping of
+        move() (no log, no listeners). Returns the Undo.
+        """
+        undo = self.board.make_code(code)
+        self.played(undo)
+        return undo
+
+    def played(self, undo):
+        # history, clocks and turn after a game move
+        piece = undo.piece
+        self.history.push(self.board.hash, isinstance(piece, Pawn) or undo.captured is not None)
+        if piece.color == 'black':
+            self.fullmove_number += 1
+        self.next_turn()
+
+    def ai_move(self, time_limit=0.5):
+        """
+        Searches the current position and plays the best move found.
+        Returns the SearchResult (move is None if there is no legal move).
+        """
+        if not self.game_active: return None
+        result = self.search(time_limit=time_limit)
+        if result.move is not None:
+            self.move(result.piece, result.move)
+        return result
+
+    def search(self, max_depth=64, time_limit=None, node_limit=None, workers=None, use_book=True):
+        # positions in the opening book are answered without searching
+        if use_book and self.book is not None:
+            code = self.book_move()
+            if code is not None:
+                result = SearchResult()
+                result.code = code
+                result.pv = [code]
+                row, col = divmod(movecode.from_square(code), COLS)
+                result.piece = self.board.squares[row][col].piece
+                result.move = movecode.to_move(code)
+                return result
+        workers = workers or self.workers
+        if workers > 1:
+            return parallel.parallel_search(self, self.get_pool(workers), workers,
+                                            max_depth, time_limit, node_limit, self.tt_size_mb)
+        return Search(self, max_depth, time_limit, node_limit, self.tt).run()
+
+    def open_book(self, path):
+        from .polyglot import Book
+
+        self.close_book()
+        self.book = Book(path)
+
+    def close_book(self):
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+    def book_move(self, rng=None):
+        """
+        Weighted random move code from the opening book for the current
+        position, None when there is no book or the position isn't in it.
+        """
+        from .polyglot import book_move
+
+        if self.book is None:
+            return None
+        return book_move(self, self.book, rng)
+
+    def get_pool(self, workers):
+        # worker processes are started once and kept for later searches
+        if self.pool is None or self.pool_workers != workers:
+            self.close()
+            self.pool = parallel.make_pool(workers)
+            self.pool_workers = workers
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def evaluate(self):
+        # tapered material + piece-square score from white's point of view,
+        # in pawns; kept up to date by the board (see evaluation.py)
+        return evaluation.evaluate(self.board)
+
+    def log_move(self, piece, move, notation=None):
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        record = {
+            'timestamp': timestamp,
+            'player': piece.color,
+            'piece': piece.name,
+            'initial_pos': f"{move.initial.col},{move.initial.row}",
+            'final_pos': f"{move.final.col},{move.final.row}",
+            'notation': notation or self.get_notation(piece, move)
+        }
+        self.move_log.append(record)
+
+    def get_notation(self, piece, move):
+        # SAN of 'move' in the current position (call before making it)
+        return san(self, movecode.from_move(move))
+
+    def pgn_game(self, headers=None, result='*'):
+        """
+        The game played so far as a PGNGame (see pgn.py).
+        """
+        from .pgn import PGNGame
+
+        headers = dict(headers or {})
+        headers.setdefault('Date', self.start_time.strftime('%Y.%m.%d'))
+        if self.start_fen != START_FEN:
+            headers['SetUp'] = '1'
+            headers['FEN'] = self.start_fen
+        return PGNGame(headers, [record['notation'] for record in self.move_log], result)
+
+    # Core Logic
+    def update_move_table(self, deadline=None):
+        """
+        Brings the legal move table up to date with the position and returns
+        True once it is complete. Generation stops at 'deadline' (a
+        time.perf_counter() value) and resumes on the next call, so the UI
+        can spread it over idle frames. A complete, empty table ends the
+        game (checkmate or stalemate), as do threefold repetition and the
+        fifty-move rule.
+        """
+        key = (self.board.hash, self.next_player)
+        if key != self.move_table_key:
+            self.move_table_key = key
+            self.move_table = {}
+            self.move_keys = set()
+            # generating is cheap; the king-safety checks are what gets spread out
+            self.table_pending = self.pseudo_legal_moves()
+
+        pending = self.table_pending
+        table = self.move_table
+        while pending:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            code = pending.pop()
+            if not self.in_check(code):
+                table.setdefault(code & 0x3F, []).append(code)
+                self.move_keys.add(movecode.key(code))
+
+        if self.game_active:
+            if not self.move_table:
+                self.end_game()
+            elif self.history.is_threefold():
+                self.end_game('threefold repetition')
+            elif self.history.is_fifty_moves():
+                self.end_game('fifty-move rule')
+        return True
+
+    def moves_from(self, row, col):
+        # legal move codes from (row, col), a lookup once the table is built
+        self.update_move_table()
+        return self.move_table.get(row * COLS + col, NO_MOVES)
+
+    def end_game(self, draw=None):
+        # 'draw' names the draw rule that ended the game; otherwise the side
+        # to move has no legal move
+        self.game_active = False
+        if draw is not None:
+            self.end_reason = draw
+            self.result = '1/2-1/2'
+        elif self.is_king_attacked(self.board, self.next_player):
+            self.end_reason = 'checkmate'
+            self.result = '0-1' if self.next_player == 'white' else '1-0'
+        else:
+            self.end_reason = 'stalemate'
+            self.result = '1/2-1/2'
+
+    def is_legal(self, code):
+        if code & CASTLING_FLAG and not self.can_castle(code):
+            return False
+        return not self.in_check(code)
+
+    def can_castle(self, code):
+        # the king may not castle out of, or through, an attacked square
+        # (the destination square is covered by in_check)
+        row, col = divmod(movecode.from_square(code), COLS)
+        step = 1 if movecode.to_square(code) % COLS > col else -1
+        squares = self.board.squares[row]
+        enemy_color = 'black' if squares[col].piece.color == 'white' else 'white'
+        return not (self.is_square_attacked(self.board, squares[col], enemy_color)
+                    or self.is_square_attacked(self.board, squares[col + step], enemy_color))
+
+    def legal_moves(self):
+        """
+        All legal moves for the side to move, as move codes.
+        """
+        return [code for code in self.pseudo_legal_moves() if not self.in_check(code)]
+
+    def pseudo_legal_moves(self, captures_only=False):
+        """
+        Moves for the side to move as move codes, without the king-safety
+        filter (castling rules are still applied). Callers must reject moves
+        that leave their king attacked after making them.
+        """
+        board = self.board
+        moves = pseudo_moves(board.bitboards, board.occupancy, self.next_player,
+                             board.castling_rights, board.ep_square, captures_only)
+        if captures_only:
+            return moves
+        return [code for code in moves if not code & CASTLING_FLAG or self.can_castle(code)]
+
+    def perft(self, depth, divide=False, workers=1):
+        """
+        Counts the leaf nodes of the legal move tree 'depth' plies deep.
+        With divide=True returns a {uci move: count} dict for the root moves.
+        With workers > 1 the root moves are counted in worker processes.
+        """
+        if workers > 1:
+            counts = parallel.parallel_perft(self, self.get_pool(workers), depth)
+            return counts if divide else sum(counts.values())
+        if not divide:
+            return self._perft(depth)
+
+        counts = {}
+        for code in self.legal_moves():
+            undo = self.board.make_code(code)
+            self.next_turn()
+            counts[movecode.uci(code)] = self._perft(depth - 1)
+            self.board.unmake_move(undo)
+            self.next_turn()
+        return counts
+
+    def _perft(self, depth):
+        if depth == 0:
+            return 1
+        moves = self.legal_moves()
+        # bulk counting: the last ply only needs the number of moves
+        if depth == 1:
+            return len(moves)
+
+        nodes = 0
+        for code in moves:
+            undo = self.board.make_code(code)
+            self.next_turn()
+            nodes += self._perft(depth - 1)
+            self.board.unmake_move(undo)
+            self.next_turn()
+        return nodes
+
+    def in_check(self, code):
+        """
+        Determines if making move 'code' leaves the current player's King in check.
+        """
+        board = self.board
+        from_sq = code & 0x3F
+        color = 'white' if board.occupancy['white'] >> from_sq & 1 else 'black'
+        return exposes_king(board.bitboards, board.occupancy, code, color)
+
+    def is_king_attacked(self, board, color):
+        king_pos = board.kings[color]
+        if not king_pos: return False
+
+        enemy_color = 'black' if color == 'white' else 'white'
+        king_sqr = board.squares[king_pos[0]][king_pos[1]]
+        return self.is_square_attacked(board, king_sqr, enemy_color)
+
+    def is_square_attacked(self, board, square, by_color):
+        """
+        True if any 'by_color' piece attacks 'square'. Looks outward from the
+        square with the board's bitboards and the attack tables (see
+        bitboard.attacked) instead of generating the enemy's moves.
+        """
+        occupancy = board.occupancy
+        return attacked(board.bitboards, occupancy['white'] | occupancy['black'],
+                        square.row * COLS + square.col, by_color)
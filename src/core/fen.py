@@ -0,0 +1,257 @@
+"""
+FEN and EPD import / export.
+
+parse_fen splits a FEN into plain values, which Board.set_fen places on an
+existing board (no new Board or Squares) and read_fen turns into
+Bitboards. EPD suites are read line by line into EPDRecord objects; only
+the text is parsed until a record's position is actually set up.
+"""
+from .const import *
+from .square import Square
+from .bitboard import Bitboards, square_index, \
+    WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FEN_PIECES = {
+    'p': 'pawn', 'n': 'knight', 'b': 'bishop',
+    'r': 'rook', 'q': 'queen', 'k': 'king',
+}
+FEN_CHARS = {name: char for char, name in FEN_PIECES.items()}
+# placement character -> (color, name)
+FEN_SYMBOLS = {char: ('black', name) for char, name in FEN_PIECES.items()}
+FEN_SYMBOLS.update({char.upper(): ('white', name) for char, name in FEN_PIECES.items()})
+FEN_CASTLING = {
+    'K': WHITE_KINGSIDE, 'Q': WHITE_QUEENSIDE,
+    'k': BLACK_KINGSIDE, 'q': BLACK_QUEENSIDE,
+}
+
+
+def parse_square(name):
+    if len(name) != 2 or name[0] not in 'abcdefgh' or name[1] not in '12345678':
+        raise ValueError(f'invalid square: {name}')
+    return square_index(ROWS - int(name[1]), ord(name[0]) - ord('a'))
+
+
+def parse_fen(fen):
+    """
+    Splits 'fen' into (placement, next_player, castling, ep_square, halfmove,
+    fullmove); placement is a list of (square, color, name). Missing trailing
+    fields default to those of the start position. Raises ValueError.
+    """
+    fields = fen.split()
+    if not fields or len(fields) > 6:
+        raise ValueError(f'invalid FEN: {fen!r}')
+
+    placement = []
+    ranks = fields[0].split('/')
+    if len(ranks) != ROWS:
+        raise ValueError(f'invalid FEN placement: {fields[0]}')
+    for row, rank in enumerate(ranks):
+        col = 0
+        for char in rank:
+            symbol = FEN_SYMBOLS.get(char)
+            if symbol is not None and col < COLS:
+                placement.append((row * COLS + col, symbol[0], symbol[1]))
+                col += 1
+            elif char in '12345678':
+                col += int(char)
+            else:
+                raise ValueError(f'invalid FEN rank: {rank}')
+        if col != COLS:
+            raise ValueError(f'invalid FEN rank: {rank}')
+
+    side = fields[1] if len(fields) > 1 else 'w'
+    if side not in ('w', 'b'):
+        raise ValueError(f'invalid FEN side to move: {side}')
+    next_player = 'white' if side == 'w' else 'black'
+
+    castling = 0
+    if len(fields) > 2 and fields[2] != '-':
+        for char in fields[2]:
+            if char not in FEN_CASTLING:
+                raise ValueError(f'invalid FEN castling rights: {fields[2]}')
+            castling |= FEN_CASTLING[char]
+
+    ep_square = None
+    if len(fields) > 3 and fields[3] != '-':
+        ep_square = parse_square(fields[3])
+        if fields[3][1] != ('6' if next_player == 'white' else '3'):
+            raise ValueError(f'invalid FEN en passant square: {fields[3]}')
+
+    try:
+        halfmove = int(fields[4]) if len(fields) > 4 else 0
+        fullmove = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError:
+        raise ValueError(f'invalid FEN move clocks: {fen!r}') from None
+
+    return placement, next_player, castling, ep_square, halfmove, fullmove
+
+
+def read_fen(fen):
+    """
+    Parses 'fen' into a Bitboards (use Bitboards.to_board() to get a Board).
+    """
+    placement, next_player, castling, ep_square, halfmove, fullmove = parse_fen(fen)
+    bbs = Bitboards()
+    for sq, color, name in placement:
+        bbs.pieces[color][name] |= 1 << sq
+    bbs.next_player = next_player
+    bbs.castling = castling
+    bbs.ep_square = ep_square
+    return bbs
+
+
+def _fen_string(piece_at, next_player, castling, ep_square, halfmove, fullmove):
+    # piece_at(row, col) -> (color, name) or None
+    ranks = []
+    for row in range(ROWS):
+        rank = ''
+        empty = 0
+        for col in range(COLS):
+            found = piece_at(row, col)
+            if found is None:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            color, name = found
+            char = FEN_CHARS[name]
+            rank += char.upper() if color == 'white' else char
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+
+    rights = ''.join(char for char, right in FEN_CASTLING.items() if castling & right) or '-'
+
+    ep = '-'
+    if ep_square is not None:
+        row, col = divmod(ep_square, COLS)
+        ep = f'{Square.get_alphacol(col)}{ROWS - row}'
+
+    side = 'w' if next_player == 'white' else 'b'
+    return f"{'/'.join(ranks)} {side} {rights} {ep} {halfmove} {fullmove}"
+
+
+def write_fen(bbs, halfmove=0, fullmove=1):
+    """
+    FEN string of a Bitboards position.
+    """
+    return _fen_string(lambda row, col: bbs.piece_at(square_index(row, col)),
+                       bbs.next_player, bbs.castling, bbs.ep_square, halfmove, fullmove)
+
+
+def board_fen(board, next_player='white', halfmove=0, fullmove=1):
+    """
+    FEN string of a Board position (see also Board.fen / Engine.fen).
+    """
+    squares = board.squares
+
+    def piece_at(row, col):
+        piece = squares[row][col].piece
+        return None if piece is None else (piece.color, piece.name)
+
+    ep_square = None
+    pawn = board.ep_pawn
+    if pawn is not None:
+        for row in (3, 4):
+            for col in range(COLS):
+                if squares[row][col].piece is pawn:
+                    ep_square = square_index(row - pawn.dir, col)
+    return _fen_string(piece_at, next_player, board.castling_rights, ep_square, halfmove, fullmove)
+
+
+# EPD
+
+class EPDRecord:
+    """
+    One EPD line: the four position fields and its operations
+    ({opcode: operand string}, e.g. {'bm': 'Nf3', 'id': 'WAC.001'}).
+    """
+
+    __slots__ = ('position', 'ops')
+
+    def __init__(self, position, ops):
+        self.position = position
+        self.ops = ops
+
+    @property
+    def fen(self):
+        # the hmvc / fmvn operations carry the move clocks
+        return f"{self.position} {self.ops.get('hmvc', '0')} {self.ops.get('fmvn', '1')}"
+
+    @property
+    def id(self):
+        return self.ops.get('id')
+
+    def __str__(self):
+        return write_epd(self.position, self.ops)
+
+
+def parse_ops(text):
+    """
+    {opcode: operand} from the operations part of an EPD line. Quoted
+    operands may contain ';'; their quotes are stripped.
+    """
+    ops = {}
+    for op in _split_ops(text):
+        opcode, _, operand = op.partition(' ')
+        operand = operand.strip()
+        if len(operand) >= 2 and operand[0] == operand[-1] == '"':
+            operand = operand[1:-1]
+        ops[opcode] = operand
+    return ops
+
+
+def _split_ops(text):
+    op = ''
+    quoted = False
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        if char == ';' and not quoted:
+            if op.strip():
+                yield op.strip()
+            op = ''
+        else:
+            op += char
+    if op.strip():
+        yield op.strip()
+
+
+def parse_epd(line):
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f'invalid EPD: {line!r}')
+    return EPDRecord(' '.join(fields[:4]), parse_ops(fields[4]) if len(fields) > 4 else {})
+
+
+def read_epd(lines):
+    """
+    Yields an EPDRecord for every non-empty, non-comment line of 'lines'
+    (an open file or any iterable of strings).
+    """
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield parse_epd(line)
+
+
+def load_epd(path):
+    with open(path) as f:
+        return list(read_epd(f))
+
+
+def write_epd(position, ops=None):
+    """
+    EPD line for 'position' (a FEN; clocks beyond the fourth field are
+    dropped) and 'ops'. Operands with spaces or ';' are quoted.
+    """
+    line = ' '.join(position.split()[:4])
+    for opcode, operand in (ops or {}).items():
+        operand = str(operand)
+        if ' ' in operand or ';' in operand or opcode == 'id':
+            operand = f'"{operand}"'
+        line += f' {opcode} {operand};' if operand else f' {opcode};'
+    return line
@@ -0,0 +1,83 @@
+"""
+Position history for repetition and fifty-move detection.
+
+keys[i] is the zobrist key of the position after i plies and clocks[i] its
+halfmove clock (plies since the last capture or pawn move). A position can
+only repeat one reached after the last irreversible move, so repetition
+checks look back at most clocks[-1] plies, every other ply (same side to
+move), which keeps them cheap enough for every search node.
+"""
+
+FIFTY_MOVES = 100
+
+
+class PositionHistory:
+
+    __slots__ = ('keys', 'clocks')
+
+    def __init__(self, key=0, halfmove=0):
+        self.keys = [key]
+        self.clocks = [halfmove]
+
+    def reset(self, key, halfmove=0):
+        self.keys = [key]
+        self.clocks = [halfmove]
+
+    def push(self, key, irreversible):
+        self.keys.append(key)
+        self.clocks.append(0 if irreversible else self.clocks[-1] + 1)
+
+    def pop(self):
+        self.keys.pop()
+        self.clocks.pop()
+
+    @property
+    def halfmove_clock(self):
+        return self.clocks[-1]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def repetitions(self):
+        """
+        Number of earlier occurrences of the current position.
+        """
+        keys = self.keys
+        key = keys[-1]
+        last = len(keys) - 1
+        first = max(0, last - self.clocks[-1])
+        count = 0
+        # two plies back can't be the same position; start at four
+        for i in range(last - 4, first - 1, -2):
+            if keys[i] == key:
+                count += 1
+        return count
+
+    def is_repetition(self):
+        # any earlier occurrence (what a search scores as a draw)
+        keys = self.keys
+        key = keys[-1]
+        last = len(keys) - 1
+        first = max(0, last - self.clocks[-1])
+        for i in range(last - 4, first - 1, -2):
+            if keys[i] == key:
+                return True
+        return False
+
+    def is_threefold(self):
+        return self.repetitions() >= 2
+
+    def is_fifty_moves(self):
+        return self.clocks[-1] >= FIFTY_MOVES
+
+    def recent(self):
+        """
+        Copy holding only the plies since the last irreversible move (all
+        that repetition checks need), e.g. to hand to a worker process.
+        """
+        start = len(self.keys) - 1 - self.clocks[-1]
+        start = max(0, start)
+        copy = PositionHistory()
+        copy.keys = self.keys[start:]
+        copy.clocks = self.clocks[start:]
+        return copy
@@ -0,0 +1,25 @@
+
+class Move:
+
+    __slots__ = ('initial', 'final', 'promotion')
+
+    def __init__(self, initial, final, promotion=None):
+        # initial and final are squares
+        self.initial = initial
+        self.final = final
+        # piece name a pawn promotes to (None means queen)
+        self.promotion = promotion
+
+    def __str__(self):
+        s = ''
+        s += f'({self.initial.col}, {self.initial.row})'
+        s += f' -> ({self.final.col}, {self.final.row})'
+        return s
+
+    def uci(self):
+        # long algebraic form used by UCI engines, e.g. e2e4 or e7e8q
+        from .movecode import from_move, uci
+        return uci(from_move(self))
+
+    def __eq__(self, other):
+        return self.initial == other.initial and self.final == other.final
\ No newline at end of file
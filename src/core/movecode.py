@@ -0,0 +1,106 @@
+"""
+Moves packed into a single int:
+
+    bits  0-5   from square (row * 8 + col)
+    bits  6-11  to square
+    bits 12-15  flags
+    bits 16-18  promotion piece (0 = none)
+
+Move generation, legality checks and search work on these codes;
+Move / Square objects are only built (to_move) for the UI.
+"""
+from .const import *
+from .move import Move
+from .square import Square
+
+# flags
+CAPTURE = 1
+DOUBLE_PUSH = 2
+EN_PASSANT = 4
+CASTLING = 8
+
+SQUARE_MASK = 0x3F
+# from + to squares, enough to identify a move for the UI
+KEY_MASK = 0xFFF
+
+PROMOTIONS = [None, 'queen', 'rook', 'bishop', 'knight']
+PROMOTION_INDEX = {name: idx for idx, name in enumerate(PROMOTIONS)}
+PROMOTION_CHARS = {'queen': 'q', 'rook': 'r', 'bishop': 'b', 'knight': 'n'}
+CHAR_PROMOTIONS = {char: name for name, char in PROMOTION_CHARS.items()}
+
+ALPHACOLS = 'abcdefgh'
+
+
+def encode(from_sq, to_sq, flags=0, promotion=0):
+    return from_sq | to_sq << 6 | flags << 12 | promotion << 16
+
+
+def from_square(code):
+    return code & SQUARE_MASK
+
+
+def to_square(code):
+    return code >> 6 & SQUARE_MASK
+
+
+def flags(code):
+    return code >> 12 & 0xF
+
+
+def promotion(code):
+    return PROMOTIONS[code >> 16]
+
+
+def is_capture(code):
+    return code & (CAPTURE << 12) != 0
+
+
+def key(code):
+    return code & KEY_MASK
+
+
+def square_name(sq):
+    row, col = divmod(sq, COLS)
+    return f'{ALPHACOLS[col]}{ROWS - row}'
+
+
+def uci(code):
+    s = square_name(from_square(code)) + square_name(to_square(code))
+    name = promotion(code)
+    if name:
+        s += PROMOTION_CHARS[name]
+    return s
+
+
+def parse_square(name):
+    if len(name) != 2 or name[0] not in ALPHACOLS or name[1] not in '12345678':
+        raise ValueError(f'invalid square: {name}')
+    return (ROWS - int(name[1])) * COLS + ALPHACOLS.index(name[0])
+
+
+def from_uci(s):
+    """
+    Move code for a uci string such as e2e4 or e7e8q. Flags are left empty,
+    as in from_move.
+    """
+    if len(s) not in (4, 5):
+        raise ValueError(f'invalid uci move: {s}')
+    if len(s) == 5 and s[4] not in CHAR_PROMOTIONS:
+        raise ValueError(f'invalid promotion piece in uci move: {s}')
+    promotion = PROMOTION_INDEX[CHAR_PROMOTIONS[s[4]]] if len(s) == 5 else 0
+    return encode(parse_square(s[:2]), parse_square(s[2:4]), 0, promotion)
+
+
+def from_move(move):
+    # flags are left empty: Board.make_code works them out from the position
+    initial, final = move.initial, move.final
+    return encode(initial.row * COLS + initial.col, final.row * COLS + final.col,
+                  0, PROMOTION_INDEX[move.promotion])
+
+
+# shared endpoints for UI moves, allocated once
+SQUARES = [Square(*divmod(sq, COLS)) for sq in range(64)]
+
+
+def to_move(code):
+    return Move(SQUARES[from_square(code)], SQUARES[to_square(code)], promotion(code))
@@ -0,0 +1,160 @@
+"""
+Root-splitting search and perft over a ProcessPoolExecutor.
+
+The position travels to the workers as Bitboards.pack() (a tuple of 15
+ints/strings); each worker keeps one Engine (and transposition table) alive
+between calls, rebuilt when a search asks for another table size.
+
+Search workers share one array of the best root score found so far per
+depth (Search.root_alpha). A worker starts every root move with the best
+score any worker has reached at that depth as its alpha, so moves that
+can't beat it are refuted cheaply instead of being searched with a full
+window in every process.
+"""
+import os
+import time
+
+from .const import *
+from .bitboard import Bitboards
+from .search import Search, SearchResult, INF
+from . import movecode
+
+# per-process engine reused across tasks
+_worker_engine = None
+# best root score per search depth, shared by the pool's processes
+_root_alpha = None
+MAX_DEPTH = 128
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def make_pool(workers):
+    # imported here: multiprocessing is slow to import and most users never need it
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import Array
+
+    # shared arrays can only reach the workers when they are started
+    root_alpha = Array('d', MAX_DEPTH + 1)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(root_alpha,))
+    pool.root_alpha = root_alpha
+    return pool
+
+
+def _init_worker(root_alpha):
+    global _root_alpha
+    _root_alpha = root_alpha
+
+
+def pack(engine):
+    return Bitboards.from_board(engine.board, engine.next_player).pack()
+
+
+def _load(packed, tt_size_mb=None, history=None):
+    # tt_size_mb None: any table will do (perft doesn't use it)
+    from .engine import Engine
+    from .history import PositionHistory
+
+    global _worker_engine
+    if _worker_engine is None or (tt_size_mb is not None and _worker_engine.tt_size_mb != tt_size_mb):
+        _worker_engine = Engine(tt_size_mb or 16)
+    bbs = Bitboards.unpack(packed)
+    _worker_engine.board = bbs.to_board()
+    _worker_engine.next_player = bbs.next_player
+    # recent game positions (for repetitions), or just this one
+    _worker_engine.history = history or PositionHistory(_worker_engine.board.hash)
+    return _worker_engine
+
+
+def _search_worker(packed, history, root_moves, max_depth, time_limit, node_limit, tt_size_mb):
+    engine = _load(packed, tt_size_mb, history)
+    search = Search(engine, max_depth, time_limit, node_limit, engine.tt, root_moves,
+                    root_alpha=_root_alpha)
+    result = search.run()
+    return result.iterations, result.nodes
+
+
+def _perft_worker(packed, root_moves, depth):
+    engine = _load(packed)
+    counts = {}
+    for code in root_moves:
+        undo = engine.board.make_code(code)
+        engine.next_turn()
+        counts[movecode.uci(code)] = engine.perft(depth - 1)
+        engine.board.unmake_move(undo)
+        engine.next_turn()
+    return counts
+
+
+def split(moves, parts):
+    # round-robin so every worker gets a mix of early (likely good) moves
+    return [chunk for chunk in (moves[i::parts] for i in range(parts)) if chunk]
+
+
+def parallel_search(engine, pool, workers, max_depth=64, time_limit=None, node_limit=None,
+                    tt_size_mb=16):
+    """
+    Splits the root moves across 'workers' processes, each running an
+    iterative-deepening search on its share while sharing the best root
+    score per depth (see the module docstring). Scores are merged at the
+    deepest iteration every worker completed; workers that didn't complete
+    any iteration, or whose moves all failed low at that depth, are left
+    out of the merge.
+    """
+    start = time.perf_counter()
+    result = SearchResult()
+    moves = Search(engine).order(engine.legal_moves())
+    if not moves:
+        return result
+
+    max_depth = min(max_depth, MAX_DEPTH)
+    root_alpha = pool.root_alpha
+    with root_alpha.get_lock():
+        root_alpha[:] = [-INF] * len(root_alpha)
+    packed = pack(engine)
+    history = engine.history.recent()
+    chunks = split(moves, workers)
+    share = node_limit // len(chunks) if node_limit else None
+    futures = [pool.submit(_search_worker, packed, history, chunk, max_depth, time_limit, share,
+                           tt_size_mb)
+               for chunk in chunks]
+    outcomes = [future.result() for future in futures]
+
+    result.nodes = sum(nodes for iterations, nodes in outcomes)
+    finished = [iterations for iterations, nodes in outcomes if iterations]
+    depth = min((iterations[-1][0] for iterations in finished), default=0)
+    for iterations in finished:
+        for it_depth, score, pv in iterations:
+            if it_depth == depth and pv and (result.code is None or score > result.score):
+                result.code, result.score, result.pv = pv[0], score, pv
+    result.depth = depth
+
+    if result.code is None:
+        # no worker completed an iteration: fall back to the best-ordered move
+        result.code = moves[0]
+        result.pv = [moves[0]]
+    row, col = divmod(movecode.from_square(result.code), COLS)
+    result.piece = engine.board.squares[row][col].piece
+    result.move = movecode.to_move(result.code)
+    result.time = time.perf_counter() - start
+    return result
+
+
+def parallel_perft(engine, pool, depth):
+    """
+    Perft divide with the root moves spread over the pool's processes.
+    Returns {uci move: count}.
+    """
+    moves = engine.legal_moves()
+    if depth <= 1:
+        return {movecode.uci(code): 1 for code in moves}
+
+    # one task per root move: the pool balances uneven subtrees
+    packed = pack(engine)
+    futures = [pool.submit(_perft_worker, packed, [code], depth) for code in moves]
+    counts = {}
+    for future in futures:
+        counts.update(future.result())
+    return counts
@@ -0,0 +1,108 @@
+"""
+Perft runner: counts move-generator leaf nodes on standard positions and
+checks them against published reference values.
+
+    python -m src.core.perft                 # every position, default depths
+    python -m src.core.perft --depth 3 --position kiwipete
+    python -m src.core.perft --divide --depth 2 --fen "<fen>"
+    python -m src.core.perft --depth 4 --workers 16
+"""
+import argparse
+import time
+
+from .engine import Engine
+from .fen import START_FEN
+
+# name, FEN, reference node counts for depth 1, 2, 3, ...
+POSITIONS = [
+    ('start', START_FEN,
+     [20, 400, 8902, 197281, 4865609]),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     [48, 2039, 97862, 4085603]),
+    ('en-passant', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     [14, 191, 2812, 43238, 674624]),
+    ('promotion', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     [6, 264, 9467, 422333]),
+    ('promotion-2', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     [44, 1486, 62379, 2103487]),
+    ('middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     [46, 2079, 89890, 3894594]),
+    ('ep-pinned', '1b1k4/8/8/1rPpK3/8/8/8/8 w - d6 0 1',
+     [5, 100, 555]),
+    ('ep-discovered', '8/8/8/1k6/3Pp3/8/8/4KQ2 b - d3 0 1',
+     [6, 121, 711]),
+    ('underpromotion', 'n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1',
+     [24, 496, 9483, 182838]),
+]
+
+DEFAULT_DEPTH = 3
+
+
+def setup(fen):
+    engine = Engine()
+    engine.set_fen(fen)
+    return engine
+
+
+def run(name, fen, expected, depth, workers=1):
+    """
+    Runs perft 1..depth on 'fen', prints one line per depth and returns
+    False if any count differs from 'expected'.
+    """
+    engine = setup(fen)
+    ok = True
+    for d in range(1, depth + 1):
+        start = time.perf_counter()
+        nodes = engine.perft(d, workers=workers)
+        elapsed = time.perf_counter() - start
+        nps = nodes / elapsed if elapsed > 0 else 0
+
+        status = ''
+        if expected and d <= len(expected):
+            match = nodes == expected[d - 1]
+            ok = ok and match
+            status = 'ok' if match else f'FAIL (expected {expected[d - 1]})'
+        print(f'{name:<14} depth {d}  nodes {nodes:>10}  {elapsed:8.2f}s  {nps:>9.0f} nps  {status}')
+    engine.close()
+    return ok
+
+
+def divide(fen, depth):
+    engine = setup(fen)
+    counts = engine.perft(depth, divide=True)
+    for move in sorted(counts):
+        print(f'{move}: {counts[move]}')
+    print(f'\nmoves {len(counts)}  nodes {sum(counts.values())}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move generator perft benchmark')
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH)
+    parser.add_argument('--position', choices=[p[0] for p in POSITIONS],
+                        help='run a single reference position')
+    parser.add_argument('--fen', help='run an arbitrary position instead')
+    parser.add_argument('--divide', action='store_true',
+                        help='print per-root-move node counts')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='count root moves in this many processes')
+    args = parser.parse_args()
+
+    if args.divide:
+        fens = {name: fen for name, fen, expected in POSITIONS}
+        divide(args.fen or fens[args.position or 'start'], args.depth)
+        return
+
+    if args.fen:
+        positions = [('custom', args.fen, None)]
+    else:
+        positions = [p for p in POSITIONS if args.position in (None, p[0])]
+
+    start = time.perf_counter()
+    ok = all([run(name, fen, expected, args.depth, args.workers) for name, fen, expected in positions])
+    print(f'\ntotal {time.perf_counter() - start:.2f}s  {"all ok" if ok else "MISMATCH"}')
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
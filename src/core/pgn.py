@@ -0,0 +1,180 @@
+"""
+Streaming PGN reader / writer.
+
+read_games yields one PGNGame at a time from any iterable of lines (e.g.
+an open file), so databases of any size can be processed without loading
+them into memory. Comments, NAGs and variations are skipped; only the main
+line's SAN moves are kept. write_games writes games as they are produced.
+
+    with open('games.pgn') as f:
+        for game in read_games(f):
+            for code in replay(engine, game):
+                ...
+"""
+import re
+
+from .fen import START_FEN
+from .san import parse_san
+
+# the seven tag roster, always written first and in this order
+ROSTER = ['Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result']
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+HEADER_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# complete {comment}, {comment running past the line, ; comment, NAG,
+# variation brackets, anything else (moves, move numbers, results)
+TOKEN_RE = re.compile(r'\{[^}]*\}|\{[^}]*$|;.*$|\$\d+|\(|\)|[^\s{}();$]+')
+MOVE_NUMBER_RE = re.compile(r'^\d+\.+')
+
+LINE_WIDTH = 79
+
+
+class PGNGame:
+
+    __slots__ = ('headers', 'moves', 'result')
+
+    def __init__(self, headers=None, moves=None, result='*'):
+        self.headers = headers if headers is not None else {}
+        # main line as SAN strings
+        self.moves = moves if moves is not None else []
+        self.result = result
+
+    @property
+    def fen(self):
+        # starting position (FEN tag for games set up from a position)
+        return self.headers.get('FEN', START_FEN)
+
+    def __str__(self):
+        return format_game(self)
+
+
+# reading
+
+def read_games(lines):
+    """
+    Yields a PGNGame for every game in 'lines'.
+    """
+    game = PGNGame()
+    in_comment = False
+    # variation nesting depth
+    depth = 0
+
+    for line in lines:
+        if in_comment:
+            end = line.find('}')
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+
+        stripped = line.strip()
+        if not stripped or stripped.startswith('%'):
+            continue
+
+        if stripped.startswith('[') and depth == 0:
+            match = HEADER_RE.match(stripped)
+            if match:
+                # tags after movetext: the previous game had no result token
+                if game.moves:
+                    yield game
+                    game = PGNGame()
+                game.headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+                continue
+
+        for match in TOKEN_RE.finditer(stripped):
+            token = match.group()
+            first = token[0]
+            if first == '{':
+                in_comment = not token.endswith('}')
+            elif first == ';' or first == '$':
+                continue
+            elif first == '(':
+                depth += 1
+            elif first == ')':
+                depth = max(0, depth - 1)
+            elif depth:
+                continue
+            elif token in RESULTS:
+                game.result = token
+                yield game
+                game = PGNGame()
+            else:
+                move = MOVE_NUMBER_RE.sub('', token)
+                if move:
+                    game.moves.append(move)
+
+    if game.moves or game.headers:
+        yield game
+
+
+def replay(engine, game):
+    """
+    Sets up 'game' on 'engine' and plays its moves on the board, yielding
+    each move code after it has been made (engine.next_player is the side
+    to move next). Raises ValueError on an illegal move.
+    """
+    engine.set_fen(game.fen)
+    board = engine.board
+    for text in game.moves:
+        code = parse_san(engine, text)
+        board.make_code(code)
+        engine.next_turn()
+        yield code
+
+
+# writing
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def format_game(game):
+    headers = dict(game.headers)
+    headers['Result'] = game.result
+    lines = []
+    for tag in ROSTER:
+        lines.append(f'[{tag} "{_escape(headers.get(tag, "?"))}"]')
+    for tag, value in headers.items():
+        if tag not in ROSTER:
+            lines.append(f'[{tag} "{_escape(value)}"]')
+    lines.append('')
+
+    # movetext, wrapped; black's first move after a FEN start gets "N..."
+    fen_fields = game.fen.split()
+    black = len(fen_fields) > 1 and fen_fields[1] == 'b'
+    number = int(fen_fields[5]) if len(fen_fields) > 5 else 1
+    tokens = []
+    for i, move in enumerate(game.moves):
+        if not black:
+            tokens.append(f'{number}.')
+        elif i == 0:
+            tokens.append(f'{number}...')
+        tokens.append(move)
+        if black:
+            number += 1
+        black = not black
+    tokens.append(game.result)
+
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f'{line} {token}' if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def write_games(f, games):
+    """
+    Writes every game of the iterable 'games' to the open file 'f' as it
+    comes, separated by blank lines. Returns the number of games written.
+    """
+    count = 0
+    for game in games:
+        if count:
+            f.write('\n')
+        f.write(format_game(game))
+        count += 1
+    return count
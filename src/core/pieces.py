@@ -0,0 +1,54 @@
+# pieces only carry identity and state; moves are generated from the
+# board's bitboards (see bitboard.pseudo_moves)
+
+# shared empty result for "no moves from this square"
+NO_MOVES = ()
+
+class Piece:
+    # engine state only; textures are looked up by the UI (see texture.py)
+    __slots__ = ('name', 'color', 'value', 'moved')
+
+    def __init__(self, name, color, value):
+        self.name = name
+        self.color = color
+        value_sign = 1 if color == 'white' else -1
+        self.value = value * value_sign
+        self.moved = False
+
+class Pawn(Piece):
+    __slots__ = ('dir', 'en_passant')
+
+    def __init__(self, color):
+        self.dir = -1 if color == 'white' else 1
+        self.en_passant = False
+        super().__init__('pawn', color, 1.0)
+
+class Knight(Piece):
+    __slots__ = ()
+
+    def __init__(self, color):
+        super().__init__('knight', color, 3.0)
+
+class Bishop(Piece):
+    __slots__ = ()
+
+    def __init__(self, color):
+        super().__init__('bishop', color, 3.001)
+
+class Rook(Piece):
+    __slots__ = ()
+
+    def __init__(self, color):
+        super().__init__('rook', color, 5.0)
+
+class Queen(Piece):
+    __slots__ = ()
+
+    def __init__(self, color):
+        super().__init__('queen', color, 9.0)
+
+class King(Piece):
+    __slots__ = ()
+
+    def __init__(self, color):
+        super().__init__('king', color, 10000.0)
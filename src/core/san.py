@@ -0,0 +1,140 @@
+"""
+Standard algebraic notation (SAN): Nf3, exd5, e8=Q, O-O, Rad1, Qh4#.
+
+Both directions work on the position currently on an Engine's board,
+i.e. before the move is made.
+"""
+import re
+
+from .const import *
+from .pieces import Pawn, King
+from . import movecode
+
+PIECE_LETTERS = {'knight': 'N', 'bishop': 'B', 'rook': 'R', 'queen': 'Q', 'king': 'K'}
+LETTER_PIECES = {letter: name for name, letter in PIECE_LETTERS.items()}
+
+SAN_RE = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$')
+
+
+def san(engine, code, legal=None):
+    """
+    SAN of the legal move 'code' for the side to move, with check / mate
+    suffix. 'legal' (engine.legal_moves()) can be passed in when known.
+    """
+    text = san_base(engine, code, legal)
+
+    # check / mate: play the move and look at the opponent
+    board = engine.board
+    undo = board.make_code(code)
+    engine.next_turn()
+    if engine.is_king_attacked(board, engine.next_player):
+        text += '+' if has_legal_move(engine) else '#'
+    board.unmake_move(undo)
+    engine.next_turn()
+    return text
+
+
+def san_base(engine, code, legal=None):
+    """
+    SAN without the check suffix (cheap: no move is played).
+    """
+    squares = engine.board.squares
+    from_sq, to_sq = movecode.from_square(code), movecode.to_square(code)
+    from_row, from_col = divmod(from_sq, COLS)
+    to_row, to_col = divmod(to_sq, COLS)
+    piece = squares[from_row][from_col].piece
+    target = squares[to_row][to_col].piece
+    to_name = movecode.square_name(to_sq)
+
+    if isinstance(piece, King) and abs(to_col - from_col) == 2:
+        return 'O-O' if to_col > from_col else 'O-O-O'
+
+    if isinstance(piece, Pawn):
+        # captures (en passant included) change file
+        if from_col != to_col:
+            text = f'{movecode.ALPHACOLS[from_col]}x{to_name}'
+        else:
+            text = to_name
+        if to_row == 0 or to_row == 7:
+            text += '=' + PIECE_LETTERS[movecode.promotion(code) or 'queen']
+        return text
+
+    # other pieces of the same kind that can also (legally) reach the square
+    rivals = []
+    for other in (legal if legal is not None else engine.pseudo_legal_moves()):
+        other_from = movecode.from_square(other)
+        if other_from != from_sq and movecode.to_square(other) == to_sq:
+            row, col = divmod(other_from, COLS)
+            if squares[row][col].piece.name == piece.name \
+                    and (legal is not None or not engine.in_check(other)):
+                rivals.append((row, col))
+
+    text = PIECE_LETTERS[piece.name]
+    if rivals:
+        if all(col != from_col for row, col in rivals):
+            text += movecode.ALPHACOLS[from_col]
+        elif all(row != from_row for row, col in rivals):
+            text += str(ROWS - from_row)
+        else:
+            text += movecode.square_name(from_sq)
+    if target is not None:
+        text += 'x'
+    return text + to_name
+
+
+def has_legal_move(engine):
+    # stops at the first legal move, unlike engine.legal_moves()
+    return any(not engine.in_check(code) for code in engine.pseudo_legal_moves())
+
+
+def parse_san(engine, text, legal=None):
+    """
+    Legal move code for the SAN string 'text' in the current position.
+    Accepts check marks, annotations (!?), 0-0 castling and a missing '='.
+    Raises ValueError for illegal or ambiguous moves.
+    """
+    # without 'legal', only the moves matching 'text' are checked for legality
+    candidates = legal if legal is not None else engine.pseudo_legal_moves()
+    squares = engine.board.squares
+    clean = text.rstrip('+#!?').replace('0', 'O')
+
+    if clean in ('O-O', 'O-O-O'):
+        for code in candidates:
+            row, col = divmod(movecode.from_square(code), COLS)
+            to_col = movecode.to_square(code) % COLS
+            if isinstance(squares[row][col].piece, King) and abs(to_col - col) == 2 \
+                    and (to_col > col) == (clean == 'O-O') \
+                    and (legal is not None or not engine.in_check(code)):
+                return code
+        raise ValueError(f'illegal move: {text}')
+
+    match = SAN_RE.match(clean.replace('e.p.', ''))
+    if match is None:
+        raise ValueError(f'invalid SAN: {text}')
+    letter, from_file, from_rank, to_name, promotion = match.groups()
+    name = LETTER_PIECES[letter] if letter else 'pawn'
+    to_sq = movecode.parse_square(to_name)
+    promotion = LETTER_PIECES[promotion] if promotion else None
+
+    found = []
+    for code in candidates:
+        if movecode.to_square(code) != to_sq:
+            continue
+        row, col = divmod(movecode.from_square(code), COLS)
+        if squares[row][col].piece.name != name:
+            continue
+        if from_file and movecode.ALPHACOLS[col] != from_file:
+            continue
+        if from_rank and ROWS - row != int(from_rank):
+            continue
+        # a promotion without a piece letter means a queen
+        code_promotion = movecode.promotion(code)
+        if code_promotion is not None and code_promotion != (promotion or 'queen'):
+            continue
+        if legal is None and engine.in_check(code):
+            continue
+        found.append(code)
+
+    if len(found) != 1:
+        raise ValueError(f"{'ambiguous' if found else 'illegal'} move: {text}")
+    return found[0]
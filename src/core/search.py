@@ -0,0 +1,298 @@
+import time
+
+from .const import *
+from .transposition import EXACT, LOWER, UPPER
+from .history import FIFTY_MOVES
+from . import movecode
+
+MATE = 100000.0
+INF = float('inf')
+# scores beyond this are mate scores, stored relative to the node in the tt
+MATE_BOUND = MATE - 1000
+
+CAPTURE_FLAG = movecode.CAPTURE << 12
+QUEEN_PROMOTION = movecode.PROMOTION_INDEX['queen']
+
+# how often (in nodes) the clock is checked
+CHECK_EVERY = 256
+
+
+class SearchResult:
+
+    def __init__(self):
+        self.code = None
+        self.score = 0.0
+        # principal variation as move codes
+        self.pv = []
+        self.depth = 0
+        self.nodes = 0
+        self.time = 0.0
+        # (depth, score, pv) of every completed iteration
+        self.iterations = []
+        # piece and Move object of 'code', filled in for Engine.move
+        self.piece = None
+        self.move = None
+
+    def __str__(self):
+        pv = ' '.join(movecode.uci(code) for code in self.pv)
+        return f'depth {self.depth} score {self.score:.2f} nodes {self.nodes} pv {pv}'
+
+
+class Search:
+    """
+    Iterative-deepening negamax with alpha-beta pruning and a capture-only
+    quiescence search, scored with Engine.evaluate (in pawns, from the side
+    to move's point of view). Stops at max_depth, after time_limit
+    seconds or after node_limit nodes, whichever comes first. Repeated
+    positions (engine.history) and the fifty-move rule score as draws.
+    Results are shared across iterations and searches through the
+    transposition table.
+    root_moves restricts the root to a subset of the legal moves (used to
+    split the root between worker processes). root_alpha, a shared array
+    of the best root score per depth, lets those workers cut their root
+    moves against each other's scores. Setting stop_event (a
+    threading.Event) ends the search early; info is called with the
+    SearchResult after every completed iteration.
+    """
+
+    def __init__(self, engine, max_depth=64, time_limit=None, node_limit=None, tt=None,
+                 root_moves=None, stop_event=None, info=None, root_alpha=None):
+        self.engine = engine
+        self.board = engine.board
+        self.history = engine.history
+        self.tt = tt
+        self.root_moves = root_moves
+        self.root_alpha = root_alpha
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.info = info
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = None
+        # previous iteration's best root move
+        self.pv_move = None
+
+    def run(self):
+        start = time.perf_counter()
+        self.deadline = start + self.time_limit if self.time_limit else None
+        result = SearchResult()
+        if self.tt is not None:
+            self.tt.new_search()
+
+        for depth in range(1, self.max_depth + 1):
+            score, pv = self.negamax(depth, 0, -INF, INF)
+            if self.stopped:
+                break
+            if not pv:
+                # every root move failed low against another worker's score:
+                # nothing to report at this depth, keep the last best move
+                result.iterations.append((depth, -INF, []))
+                result.depth = depth
+                continue
+            result.code = pv[0]
+            result.score = score
+            result.pv = pv
+            result.depth = depth
+            result.iterations.append((depth, score, pv))
+            self.pv_move = result.code
+            if self.info is not None:
+                result.nodes = self.nodes
+                result.time = time.perf_counter() - start
+                self.info(result)
+            # a forced mate has been found, deeper search won't change it
+            if abs(score) >= MATE - depth:
+                break
+
+        if result.code is None:
+            # out of time before depth 1 finished: fall back to the best-ordered move
+            moves = self.order(self.root_moves or self.engine.legal_moves())
+            if moves:
+                result.code = moves[0]
+                result.pv = [result.code]
+
+        if result.code is not None:
+            row, col = divmod(movecode.from_square(result.code), COLS)
+            result.piece = self.board.squares[row][col].piece
+            result.move = movecode.to_move(result.code)
+        result.nodes = self.nodes
+        result.time = time.perf_counter() - start
+        return result
+
+    # tree search
+
+    def negamax(self, depth, ply, alpha, beta):
+        if depth == 0:
+            return self.quiesce(alpha, beta), []
+
+        self.count_node()
+        if self.stopped:
+            return 0.0, []
+
+        # repeated positions and the fifty-move rule are draws (checked
+        # before the tt, whose scores don't depend on the path)
+        history = self.history
+        if ply > 0 and (history.clocks[-1] >= FIFTY_MOVES or history.is_repetition()):
+            return 0.0, []
+
+        tt = self.tt
+        board = self.board
+        key = board.hash
+        hash_move = self.pv_move if ply == 0 else None
+        if tt is not None:
+            entry = tt.probe(key)
+            if entry is not None:
+                tt_depth, tt_score, bound, tt_move = entry
+                hash_move = tt_move or hash_move
+                if ply > 0 and tt_depth >= depth:
+                    tt_score = self.score_from_tt(tt_score, ply)
+                    if bound == EXACT \
+                            or (bound == LOWER and tt_score >= beta) \
+                            or (bound == UPPER and tt_score <= alpha):
+                        return tt_score, []
+
+        engine = self.engine
+        color = engine.next_player
+        alpha_orig = alpha
+        best_pv = []
+        legal = 0
+        if ply == 0 and self.root_moves is not None:
+            moves = self.root_moves
+        else:
+            moves = engine.pseudo_legal_moves()
+        root_alpha = self.root_alpha if ply == 0 else None
+        for code in self.order(moves, hash_move):
+            if root_alpha is not None and root_alpha[depth] > alpha:
+                # another worker already has a root move this good
+                alpha = alpha_orig = root_alpha[depth]
+            undo = board.make_code(code)
+            if engine.is_king_attacked(board, color):
+                board.unmake_move(undo)
+                continue
+            legal += 1
+            history.push(board.hash, undo.piece.name == 'pawn' or undo.captured is not None)
+            engine.next_turn()
+            score, pv = self.negamax(depth - 1, ply + 1, -beta, -alpha)
+            score = -score
+            board.unmake_move(undo)
+            history.pop()
+            engine.next_turn()
+
+            if self.stopped:
+                return 0.0, []
+            if score > alpha or not best_pv:
+                if score > alpha:
+                    alpha = score
+                    if root_alpha is not None:
+                        self.post_root_score(depth, score)
+                best_pv = [code] + pv
+                if alpha >= beta:
+                    break
+
+        if not legal:
+            # checkmate or stalemate
+            if engine.is_king_attacked(board, color):
+                return -MATE + ply, []
+            return 0.0, []
+
+        if tt is not None:
+            if alpha >= beta:
+                bound = LOWER
+            elif alpha > alpha_orig:
+                bound = EXACT
+            else:
+                bound = UPPER
+            best_move = best_pv[0] if bound != UPPER else None
+            tt.store(key, depth, self.score_to_tt(alpha, ply), bound, best_move)
+        if root_alpha is not None and alpha <= alpha_orig:
+            return alpha, []
+        return alpha, best_pv
+
+    def quiesce(self, alpha, beta):
+        self.count_node()
+        if self.stopped:
+            return 0.0
+
+        stand_pat = self.evaluate()
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        engine = self.engine
+        board = self.board
+        color = engine.next_player
+        for code in self.order(engine.pseudo_legal_moves(captures_only=True)):
+            undo = board.make_code(code)
+            if engine.is_king_attacked(board, color):
+                board.unmake_move(undo)
+                continue
+            engine.next_turn()
+            score = -self.quiesce(-beta, -alpha)
+            board.unmake_move(undo)
+            engine.next_turn()
+
+            if self.stopped:
+                return 0.0
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    # helpers
+
+    def post_root_score(self, depth, score):
+        with self.root_alpha.get_lock():
+            if score > self.root_alpha[depth]:
+                self.root_alpha[depth] = score
+
+    def evaluate(self):
+        score = self.engine.evaluate()
+        return score if self.engine.next_player == 'white' else -score
+
+    def score_to_tt(self, score, ply):
+        # mate scores are stored as distance from this node, not from the root
+        if score >= MATE_BOUND:
+            return score + ply
+        if score <= -MATE_BOUND:
+            return score - ply
+        return score
+
+    def score_from_tt(self, score, ply):
+        if score >= MATE_BOUND:
+            return score - ply
+        if score <= -MATE_BOUND:
+            return score + ply
+        return score
+
+    def order(self, moves, hash_move=None):
+        # hash / previous iteration's best move first, then captures by
+        # most valuable victim / least valuable attacker, then the rest
+        squares = self.board.squares
+
+        def key(code):
+            if code == hash_move:
+                return -INF
+            score = 0.0
+            if code & CAPTURE_FLAG:
+                to_row, to_col = divmod(code >> 6 & 0x3F, COLS)
+                from_row, from_col = divmod(code & 0x3F, COLS)
+                victim = squares[to_row][to_col].piece
+                # en passant leaves the target square empty
+                victim_value = abs(victim.value) if victim is not None else 1.0
+                score = 10 * victim_value - abs(squares[from_row][from_col].piece.value)
+            if code >> 16 == QUEEN_PROMOTION:
+                score += 9
+            return -score
+        return sorted(moves, key=key)
+
+    def count_node(self):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                self.stopped = True
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.stopped = True
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.stopped = True
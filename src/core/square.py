@@ -1,6 +1,8 @@
 
 class Square:
 
+    __slots__ = ('row', 'col', 'piece', 'alphacol')
+
     ALPHACOLS = {0: 'a', 1: 'b', 2: 'c', 3: 'd', 4: 'e', 5: 'f', 6: 'g', 7: 'h'}
 
     def __init__(self, row, col, piece=None):
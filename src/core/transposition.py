@@ -0,0 +1,90 @@
+# bound types
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# rough memory cost of one entry: a slot in each of the six parallel lists
+# plus the int/float objects they point to
+ENTRY_SIZE = 96
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist key.
+    Entries live in preallocated parallel lists indexed by key & mask, so
+    memory never grows past the cap given in megabytes. On a slot collision
+    the deeper result wins, unless the stored one is from an older search.
+    """
+
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        count = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE)
+        # round down to a power of two so indexing is a single mask
+        self.size = 1 << (count.bit_length() - 1)
+        self.mask = self.size - 1
+        self.keys = [None] * self.size
+        self.depths = [0] * self.size
+        self.scores = [0.0] * self.size
+        self.bounds = [EXACT] * self.size
+        self.moves = [None] * self.size
+        self.ages = [0] * self.size
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        # entries from earlier searches become replaceable
+        self.age += 1
+
+    def clear(self):
+        self.__init__(self.size_mb)
+
+    def probe(self, key):
+        """
+        Returns (depth, score, bound, move) for 'key', or None.
+        """
+        self.probes += 1
+        idx = key & self.mask
+        if self.keys[idx] != key:
+            return None
+        self.hits += 1
+        return self.depths[idx], self.scores[idx], self.bounds[idx], self.moves[idx]
+
+    def store(self, key, depth, score, bound, move):
+        idx = key & self.mask
+        stored = self.keys[idx]
+        if stored is not None and stored != key:
+            # depth-preferred replacement
+            if self.ages[idx] == self.age and self.depths[idx] > depth:
+                return
+            self.overwrites += 1
+        elif stored == key and move is None:
+            # keep the best move of a previous visit
+            move = self.moves[idx]
+        self.keys[idx] = key
+        self.depths[idx] = depth
+        self.scores[idx] = score
+        self.bounds[idx] = bound
+        self.moves[idx] = move
+        self.ages[idx] = self.age
+        self.stores += 1
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def usage(self):
+        # fraction of slots filled, sampled over the first 1000
+        sample = min(1000, self.size)
+        return sum(1 for key in self.keys[:sample] if key is not None) / sample
+
+    def stats(self):
+        return {
+            'size': self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate(),
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+        }
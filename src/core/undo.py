@@ -0,0 +1,34 @@
+class Undo:
+
+    __slots__ = ('piece', 'code', 'last_code', 'moved', 'captured', 'captured_square',
+                 'en_passant_capture', 'ep_pawn', 'rook', 'rook_initial', 'rook_final',
+                 'rook_moved', 'promoted', 'hash', 'castling_rights', 'ep_key', 'ep_square', 'mg', 'eg', 'phase')
+
+    def __init__(self, piece, code, last_code, moved):
+        # state needed by Board.unmake_move to restore the position
+        self.piece = piece
+        self.code = code
+        self.last_code = last_code
+        self.moved = moved
+        # captured piece and the square it was taken on (differs from
+        # move.final for en passant captures)
+        self.captured = None
+        self.captured_square = None
+        self.en_passant_capture = False
+        # pawn flagged as capturable en passant before the move
+        self.ep_pawn = None
+        # castling rook, its origin / destination squares and moved flag
+        self.rook = None
+        self.rook_initial = None
+        self.rook_final = None
+        self.rook_moved = False
+        # piece the pawn was promoted to
+        self.promoted = None
+        # incrementally maintained board state, restored as is
+        self.hash = 0
+        self.castling_rights = 0
+        self.ep_key = 0
+        self.ep_square = None
+        self.mg = 0
+        self.eg = 0
+        self.phase = 0
@@ -0,0 +1,58 @@
+import random
+
+from .const import *
+from .bitboard import COLORS, PIECE_TYPES, square_index, \
+    WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE
+
+# fixed seed so keys are identical across runs and processes
+_rng = random.Random(0x2545F4914F6CDD1D)
+
+
+def _rand64():
+    return _rng.getrandbits(64)
+
+
+# PIECE_KEYS[color][name][square index]
+PIECE_KEYS = {color: {name: [_rand64() for sq in range(64)] for name in PIECE_TYPES}
+              for color in COLORS}
+# xor-ed in when black is to move
+SIDE_KEY = _rand64()
+# one key per en passant file
+EP_KEYS = [_rand64() for col in range(COLS)]
+# one key per combination of the four castling right bits
+_CASTLING_BASE = [_rand64() for right in range(4)]
+CASTLING_KEYS = []
+for rights in range(16):
+    key = 0
+    for bit in range(4):
+        if rights & (1 << bit):
+            key ^= _CASTLING_BASE[bit]
+    CASTLING_KEYS.append(key)
+
+# rights that survive a move touching each square: anything leaving or
+# landing on a king or rook home square clears the matching rights
+CASTLING_MASK = [0xF] * 64
+CASTLING_MASK[square_index(7, 4)] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[square_index(7, 7)] &= ~WHITE_KINGSIDE
+CASTLING_MASK[square_index(7, 0)] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[square_index(0, 4)] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[square_index(0, 7)] &= ~BLACK_KINGSIDE
+CASTLING_MASK[square_index(0, 0)] &= ~BLACK_QUEENSIDE
+
+
+def compute_hash(board, next_player='white'):
+    """
+    Full Zobrist key of 'board' from scratch. Board keeps its key up to date
+    incrementally, this is for setting up positions and for verification.
+    """
+    key = 0
+    for row in range(ROWS):
+        for col in range(COLS):
+            piece = board.squares[row][col].piece
+            if piece is not None:
+                key ^= PIECE_KEYS[piece.color][piece.name][square_index(row, col)]
+    if next_player == 'black':
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[board.castling_rights]
+    key ^= board.ep_key
+    return key
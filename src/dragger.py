@@ -4,7 +4,8 @@ from .const import *
 
 class Dragger:
 
-    def __init__(self):
+    def __init__(self, textures):
+        self.textures = textures
         self.piece = None
         self.dragging = False
         self.mouseX = 0
@@ -15,16 +16,14 @@ class Dragger:
     # blit method
 
     def update_blit(self, surface):
-        # texture
-        self.piece.set_texture(size=128)
-        texture = self.piece.texture
         # img
-        img = pygame.image.load(texture)
+        img = self.textures.get(self.piece, size=128)
         # rect
         img_center = (self.mouseX, self.mouseY)
-        self.piece.texture_rect = img.get_rect(center=img_center)
+        texture_rect = img.get_rect(center=img_center)
         # blit
-        surface.blit(img, self.piece.texture_rect)
+        surface.blit(img, texture_rect)
+        return texture_rect
 
     # other methods
 
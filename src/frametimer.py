@@ -0,0 +1,28 @@
+import time
+
+
+class FrameTimer:
+    """
+    Average time spent drawing a frame, over the last 'window' frames.
+    """
+
+    def __init__(self, window=60):
+        self.window = window
+        self.total = 0.0
+        self.frames = 0
+        self.start = 0.0
+        # last completed average, in milliseconds
+        self.average_ms = 0.0
+
+    def begin(self):
+        self.start = time.perf_counter()
+
+    def end(self):
+        self.total += time.perf_counter() - self.start
+        self.frames += 1
+        if self.frames == self.window:
+            self.average_ms = self.total / self.frames * 1000
+            self.total = 0.0
+            self.frames = 0
+            return True
+        return False
@@ -0,0 +1,19 @@
+"""
+PGN record of each game played in the UI. The moves themselves are
+appended to the binary game store (src.gamestore) as they are played.
+"""
+
+
+def save_pgn(engine, filename='game_log.pgn', headers=None, result='*'):
+    """
+    Appends the game played on 'engine' to the PGN file 'filename'.
+    """
+    from .core.pgn import write_games
+
+    if not engine.move_log:
+        return
+    game = engine.pgn_game(headers, result)
+    with open(filename, 'a') as f:
+        if f.tell():
+            f.write('\n')
+        write_games(f, [game])
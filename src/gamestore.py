@@ -0,0 +1,389 @@
+"""
+Append-only binary game store.
+
+    python -m src.gamestore convert game_log.csv game_log.bin
+    python -m src.gamestore info game_log.bin [--games]
+
+The data file is a 16-byte file header followed by 16-byte records:
+
+    game   type 1, flags, FEN length, game number, start time (ms since epoch),
+           then the FEN (only for games not from the start position),
+           zero-padded to a whole number of records
+    move   type 2, color / piece, ply, move code, ms since the game started
+    end    type 3, result, plies, game number
+
+Moves are appended as they are played, flushed to the OS right away (so a
+crash of the program loses nothing) and fsync-ed in batches. A side file
+(<path>.idx) holds the offset of every game record, so game N is found
+without a scan; the writer repairs it on open if it fell behind the data.
+Reads go through mmap.
+"""
+import argparse
+import datetime
+import mmap
+import os
+import struct
+import time
+from array import array
+
+from .core.fen import START_FEN
+from .core.bitboard import PIECE_TYPES
+from .core import movecode
+
+MAGIC = b'CHGS'
+VERSION = 1
+RECORD_SIZE = 16
+
+FILE_HEADER = struct.Struct('<4sHH8x')
+GAME = struct.Struct('<BBHIq')
+MOVE = struct.Struct('<BBHII4x')
+END = struct.Struct('<BBHI8x')
+INDEX = struct.Struct('<Q')
+
+GAME_RECORD = 1
+MOVE_RECORD = 2
+END_RECORD = 3
+
+# game flags
+HAS_FEN = 1
+# move piece byte: index in PIECE_TYPES, high bit set for black
+BLACK = 0x80
+
+RESULTS = ['*', '1-0', '0-1', '1/2-1/2']
+
+
+def _padded(length):
+    return -(-length // RECORD_SIZE) * RECORD_SIZE
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class StoredMove:
+
+    __slots__ = ('ply', 'color', 'piece', 'code', 'ms')
+
+    def __init__(self, ply, color, piece, code, ms):
+        self.ply = ply
+        self.color = color
+        self.piece = piece
+        # move code as played (from / to / promotion, see movecode.from_move)
+        self.code = code
+        # milliseconds since the game started
+        self.ms = ms
+
+    def uci(self):
+        return movecode.uci(self.code)
+
+
+class StoredGame:
+
+    __slots__ = ('number', 'start_ms', 'fen', 'result', 'moves')
+
+    def __init__(self, number, start_ms, fen, result, moves):
+        self.number = number
+        self.start_ms = start_ms
+        self.fen = fen
+        # '*' for games that were never ended (e.g. the program crashed)
+        self.result = result
+        self.moves = moves
+
+    @property
+    def start_time(self):
+        return datetime.datetime.fromtimestamp(self.start_ms / 1000)
+
+    def __len__(self):
+        return len(self.moves)
+
+
+# reading
+
+def _scan_games(data, start, end):
+    # offsets of the game records in data[start:end]
+    offsets = []
+    pos = start
+    while pos + RECORD_SIZE <= end:
+        kind = data[pos]
+        if kind == GAME_RECORD:
+            offsets.append(pos)
+            fen_length = GAME.unpack_from(data, pos)[2]
+            pos += RECORD_SIZE + _padded(fen_length)
+        else:
+            pos += RECORD_SIZE
+    return offsets
+
+
+def _read_index(path, data_size):
+    offsets = array('Q')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        offsets.frombytes(raw[:len(raw) // INDEX.size * INDEX.size])
+    # entries past the end of the data (data lost in a crash) are dropped
+    while offsets and offsets[-1] + RECORD_SIZE > data_size:
+        offsets.pop()
+    return offsets
+
+
+class GameStore:
+    """
+    Read-only view of a store: len(store), store[n] (0-based) and iteration
+    over all games.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.end = FILE_HEADER.size + (size - FILE_HEADER.size) // RECORD_SIZE * RECORD_SIZE
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or record_size != RECORD_SIZE:
+            raise ValueError(f'{path} is not a game store')
+
+        self.offsets = _read_index(path + '.idx', self.end)
+        # games written after the index was last synced: the scan resumes
+        # after the last indexed game record (and its FEN records)
+        start = FILE_HEADER.size
+        if self.offsets:
+            last = self.offsets[-1]
+            if self.data[last] == GAME_RECORD:
+                start = last + RECORD_SIZE + _padded(GAME.unpack_from(self.data, last)[2])
+            else:
+                # the index doesn't match the data; rebuild it
+                self.offsets = array('Q')
+        self.offsets.extend(_scan_games(self.data, start, self.end))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __iter__(self):
+        for n in range(len(self.offsets)):
+            yield self[n]
+
+    def __getitem__(self, n):
+        if n < 0:
+            n += len(self.offsets)
+        data = self.data
+        pos = self.offsets[n]
+        end = self.offsets[n + 1] if n + 1 < len(self.offsets) else self.end
+        kind, flags, fen_length, number, start_ms = GAME.unpack_from(data, pos)
+        pos += RECORD_SIZE
+        fen = START_FEN
+        if flags & HAS_FEN:
+            fen = data[pos:pos + fen_length].decode('ascii')
+        pos += _padded(fen_length)
+
+        moves = []
+        result = '*'
+        for record in struct.iter_unpack('<BBHII4x', data[pos:end]):
+            kind, piece, ply, code, ms = record
+            if kind == MOVE_RECORD:
+                color = 'black' if piece & BLACK else 'white'
+                moves.append(StoredMove(ply, color, PIECE_TYPES[piece & ~BLACK], code, ms))
+            elif kind == END_RECORD:
+                result = RESULTS[piece]
+        return StoredGame(number, start_ms, fen, result, moves)
+
+    def rows(self):
+        """
+        Move-log style row dicts (as in game_log.csv) for every stored move.
+        """
+        for game in self:
+            for move in game.moves:
+                timestamp = datetime.datetime.fromtimestamp((game.start_ms + move.ms) / 1000)
+                from_row, from_col = divmod(movecode.from_square(move.code), 8)
+                to_row, to_col = divmod(movecode.to_square(move.code), 8)
+                yield {
+                    'timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                    'player': move.color,
+                    'piece': move.piece,
+                    'initial_pos': f'{from_col},{from_row}',
+                    'final_pos': f'{to_col},{to_row}',
+                    'notation': move.uci(),
+                }
+
+
+# writing
+
+class GameStoreWriter:
+    """
+    Appends games to a store. Records go through a buffered file and are
+    flushed every 'flush_every' records; fsync runs every 'sync_every'
+    records or 'sync_interval' seconds, and when a game ends.
+    """
+
+    def __init__(self, path, flush_every=1, sync_every=32, sync_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        if not os.path.exists(path) or os.path.getsize(path) < FILE_HEADER.size:
+            with open(path, 'wb') as f:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+        self._repair()
+
+        self.file = open(path, 'ab')
+        self.index = open(path + '.idx', 'ab')
+        self.unflushed = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        # open game
+        self.game_start = None
+        self.ply = 0
+
+    def _repair(self):
+        # drop a partly written record and bring the index up to date
+        size = os.path.getsize(self.path)
+        end = FILE_HEADER.size + (size - FILE_HEADER.size) // RECORD_SIZE * RECORD_SIZE
+        if end != size:
+            os.truncate(self.path, end)
+        with GameStore(self.path) as store:
+            offsets = store.offsets
+        with open(self.path + '.idx', 'wb') as f:
+            f.write(offsets.tobytes())
+        self.games = len(offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def begin_game(self, fen=START_FEN, start_ms=None):
+        if self.game_start is not None:
+            self.end_game()
+        self.game_start = _now_ms() if start_ms is None else start_ms
+        self.ply = 0
+        fen_bytes = b'' if fen == START_FEN else fen.encode('ascii')
+        flags = HAS_FEN if fen_bytes else 0
+
+        self.file.flush()
+        offset = self.file.tell()
+        record = GAME.pack(GAME_RECORD, flags, len(fen_bytes), self.games, self.game_start)
+        self._append(record + fen_bytes.ljust(_padded(len(fen_bytes)), b'\0'))
+        self.index.write(INDEX.pack(offset))
+        self.games += 1
+
+    def add_move(self, color, piece, code, at_ms=None):
+        """
+        Appends a move of the open game (one is started if none is open).
+        """
+        if self.game_start is None:
+            self.begin_game()
+        self.ply += 1
+        ms = (_now_ms() if at_ms is None else at_ms) - self.game_start
+        piece_byte = PIECE_TYPES.index(piece) | (BLACK if color == 'black' else 0)
+        self._append(MOVE.pack(MOVE_RECORD, piece_byte, self.ply, code, max(0, ms)))
+
+    def end_game(self, result='*'):
+        if self.game_start is None:
+            return
+        self._append(END.pack(END_RECORD, RESULTS.index(result), self.ply, self.games - 1))
+        self.game_start = None
+        self.sync()
+
+    def on_move(self, piece, move, undo):
+        # Engine.move_listeners hook
+        self.add_move(piece.color, piece.name, undo.code)
+
+    def _append(self, data):
+        self.file.write(data)
+        self.unflushed += 1
+        self.unsynced += 1
+        if self.unflushed >= self.flush_every:
+            self.flush()
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def flush(self):
+        self.file.flush()
+        self.index.flush()
+        self.unflushed = 0
+
+    def sync(self):
+        self.flush()
+        os.fsync(self.file.fileno())
+        os.fsync(self.index.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.end_game()
+        self.sync()
+        self.file.close()
+        self.index.close()
+
+
+# conversion
+
+def convert_csv(csv_path, store_path, chunk_size=10000):
+    """
+    Appends the games of a CSV move log to a store. Game boundaries are
+    found as in analyze_log (a white move that doesn't fit the current game
+    but is legal from the start position starts a new one).
+    """
+    from .analyze_log import GameReplayer, read_chunks, parse_pos
+
+    replayer = GameReplayer(depth=0)
+    moves = 0
+    with GameStoreWriter(store_path, flush_every=256, sync_every=4096) as writer:
+        game = 0
+        for chunk in read_chunks(csv_path, chunk_size):
+            for row in chunk:
+                if replayer.feed(row) is None:
+                    continue
+                at_ms = int(datetime.datetime.strptime(row['timestamp'], '%Y-%m-%d %H:%M:%S')
+                            .timestamp() * 1000)
+                if replayer.game != game:
+                    game = replayer.game
+                    writer.begin_game(start_ms=at_ms)
+                initial, final = parse_pos(row['initial_pos']), parse_pos(row['final_pos'])
+                code = movecode.encode(initial[0] * 8 + initial[1], final[0] * 8 + final[1])
+                writer.add_move(row['player'], row['piece'], code, at_ms)
+                moves += 1
+    return replayer.game, moves, replayer.skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Binary game store tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    convert = sub.add_parser('convert', help='append the games of a CSV move log to a store')
+    convert.add_argument('csv')
+    convert.add_argument('store')
+    info = sub.add_parser('info', help='summary of a store')
+    info.add_argument('store')
+    info.add_argument('--games', action='store_true', help='one line per game')
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        start = time.perf_counter()
+        games, moves, skipped = convert_csv(args.csv, args.store)
+        print(f'games {games}  moves {moves}  skipped rows {skipped}  '
+              f'{time.perf_counter() - start:.2f}s')
+
+    elif args.command == 'info':
+        with GameStore(args.store) as store:
+            moves = 0
+            for game in store:
+                moves += len(game)
+                if args.games:
+                    print(f'{game.number:>6}  {game.start_time:%Y-%m-%d %H:%M}  {len(game):>4} plies  '
+                          f'{game.result:<7}  {" ".join(move.uci() for move in game.moves[:6])}')
+            print(f'games {len(store)}  moves {moves}  {os.path.getsize(args.store)} bytes')
+
+
+if __name__ == '__main__':
+    main()
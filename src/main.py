@@ -1,13 +1,31 @@
+import os
 import pygame
 import sys
+import time
 
 from .const import *
-from .engine import Engine
+from .core.engine import Engine
 from .sidebar import Sidebar
-from .square import Square
-from .move import Move
+from .core.square import Square
+from .core.move import Move
 from .dragger import Dragger
 from .config import Config
+from .texture import Textures
+from .frametimer import FrameTimer
+from .renderer import Renderer
+from .textcache import TextCache
+from .analysis import AnalysisWorker, ANALYSIS_EVENT
+from .core import movecode
+from . import gamelog
+from .gamestore import GameStoreWriter
+
+# part of each frame that may be spent generating legal moves
+IDLE_SHARE = 0.5
+# window events after which the screen contents can't be trusted
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED,
+                 pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED)
+# opening book for the AI (python -m src.core.polyglot build games.pgn book.bin)
+BOOK_FILE = 'book.bin'
 
 class Main:
 
@@ -22,30 +40,35 @@ class Main:
         pygame.display.set_caption('Chess')
         
         self.engine = Engine()
-        self.dragger = Dragger()
+        self.engine.move_listeners.append(self.on_move)
+        # the AI plays from a Polyglot opening book when there is one
+        if os.path.exists(BOOK_FILE):
+            self.engine.open_book(BOOK_FILE)
+        # every move is appended to the game store as it is played
+        self.store = GameStoreWriter('game_log.bin')
+        self.engine.move_listeners.append(self.store.on_move)
+        # piece images are loaded once, after the display mode is set
+        self.textures = Textures()
+        self.dragger = Dragger(self.textures)
+        self.frame_timer = FrameTimer()
+        self.clock = pygame.time.Clock()
         self.config = Config()
-        self.sidebar = Sidebar(self.screen, self.screen_width, self.screen_height)
+        self.text_cache = TextCache()
+        self.sidebar = Sidebar(self.screen, self.screen_width, self.screen_height, self.text_cache)
+        self.renderer = Renderer(self.screen, self.config, self.textures, self.dragger,
+                                 self.sidebar, self.text_cache)
+        # engine search runs on a background thread and reports via ANALYSIS_EVENT
+        self.analysis = AnalysisWorker()
+        self.analyzing = False
+        self.analysed_key = None
 
     def mainloop(self):
         
-        screen = self.screen
         engine = self.engine
         board = self.engine.board
         dragger = self.dragger
         
         while True:
-            # show methods
-            self.show_bg(screen)
-            self.show_last_move(screen)
-            self.show_moves(screen)
-            self.show_pieces(screen)
-            self.show_hover(screen)
-            
-            # Show Sidebar
-            self.sidebar.show_history(engine.move_log)
-
-            if dragger.dragging:
-                dragger.update_blit(screen)
 
             for event in pygame.event.get():
 
@@ -63,17 +86,9 @@ class Main:
                             piece = board.squares[clicked_row][clicked_col].piece
                             # valid piece (color) ?
                             if piece.color == engine.next_player:
-                                # Use Engine to calculate moves
-                                engine.calculate_moves(piece, clicked_row, clicked_col)
-                                
+                                # its legal moves come from the engine's move table
                                 dragger.save_initial(event.pos)
                                 dragger.drag_piece(piece)
-                                # show methods 
-                                self.show_bg(screen)
-                                self.show_last_move(screen)
-                                self.show_moves(screen)
-                                self.show_pieces(screen)
-                                self.sidebar.show_history(engine.move_log)
                 
                 # mouse motion
                 elif event.type == pygame.MOUSEMOTION:
@@ -85,14 +100,6 @@ class Main:
 
                         if dragger.dragging:
                             dragger.update_mouse(event.pos)
-                            # show methods
-                            self.show_bg(screen)
-                            self.show_last_move(screen)
-                            self.show_moves(screen)
-                            self.show_pieces(screen)
-                            self.show_hover(screen)
-                            self.sidebar.show_history(engine.move_log)
-                            dragger.update_blit(screen)
                 
                 # click release
                 elif event.type == pygame.MOUSEBUTTONUP:
@@ -110,25 +117,16 @@ class Main:
 
                         # valid move ?
                         if engine.valid_move(dragger.piece, move):
-                            # normal capture
-                            captured = board.squares[released_row][released_col].has_piece()
-                            
-                            # Execute move via Engine
+                            # Execute move via Engine (sounds play in on_move)
                             engine.move(dragger.piece, move)
-                            
-                            board.set_true_en_passant(dragger.piece)                            
-
-                            # sounds
-                            self.play_sound(captured)
-                            
-                            # show methods
-                            self.show_bg(screen)
-                            self.show_last_move(screen)
-                            self.show_pieces(screen)
-                            self.sidebar.show_history(engine.move_log)
                     
                     dragger.undrag_piece()
                 
+                # scroll the move history
+                elif event.type == pygame.MOUSEWHEEL:
+                    if self.sidebar.rect.collidepoint(pygame.mouse.get_pos()):
+                        self.sidebar.scroll_by(-event.y)
+                
                 # key press
                 elif event.type == pygame.KEYDOWN:
                     
@@ -136,81 +134,99 @@ class Main:
                     if event.key == pygame.K_t:
                         self.change_theme()
 
-                     # changing themes
+                    # new game; the finished one is saved first
                     if event.key == pygame.K_r:
+                        self.save_game()
+                        self.sidebar.clear_eval()
                         engine.reset() # This needs implementation in Engine if we want reset
                         engine = self.engine
                         board = self.engine.board
                         dragger = self.dragger
                     
-                    # AI Move (Test)
-                    if event.key == pygame.K_a:
-                        engine.ai_move()
-                        self.show_pieces(screen)
+                    # AI Move (Test): from the opening book, else searched in the background
+                    if event.key == pygame.K_a and engine.game_active:
+                        code = engine.book_move()
+                        if code is not None:
+                            self.play_code(code)
+                        else:
+                            self.analysis.start(engine, time_limit=0.5, play=True)
+                            self.analysed_key = board.hash
+
+                    # toggle continuous analysis of the position
+                    if event.key == pygame.K_e:
+                        self.analyzing = not self.analyzing
+                        self.analysed_key = None
+                        if not self.analyzing:
+                            self.analysis.cancel()
+                            self.sidebar.clear_eval()
+
+                # window uncovered, restored or resized: redraw everything
+                elif event.type in REDRAW_EVENTS:
+                    self.renderer.invalidate()
+
+                # engine analysis results
+                elif event.type == ANALYSIS_EVENT:
+                    self.analysis_event(event)
 
                 # quit application
                 elif event.type == pygame.QUIT:
-                    engine.save_log() # Save log on exit
+                    self.analysis.cancel()
+                    self.save_game()
+                    self.store.close()
                     pygame.quit()
                     sys.exit()
-            
-            pygame.display.update()
-
-    # Rendering helpers (moved/adapted from Game)
-    def show_bg(self, surface):
-        theme = self.config.theme
-        for row in range(ROWS):
-            for col in range(COLS):
-                color = theme.bg.light if (row + col) % 2 == 0 else theme.bg.dark
-                rect = (col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE)
-                pygame.draw.rect(surface, color, rect)
-                
-                if col == 0:
-                    color = theme.bg.dark if row % 2 == 0 else theme.bg.light
-                    lbl = self.config.font.render(str(ROWS-row), 1, color)
-                    surface.blit(lbl, (5, 5 + row * SQSIZE))
-                if row == 7:
-                    color = theme.bg.dark if (row + col) % 2 == 0 else theme.bg.light
-                    lbl = self.config.font.render(Square.get_alphacol(col), 1, color)
-                    surface.blit(lbl, (col * SQSIZE + SQSIZE - 20, HEIGHT - 20))
-
-    def show_pieces(self, surface):
+
+            # the position changed: drop work on the old one
+            if board.hash != self.analysed_key:
+                self.analysis.cancel()
+                self.analysed_key = None
+                if self.analyzing and engine.game_active:
+                    self.analysis.start(engine)
+                    self.analysed_key = board.hash
+
+            # draw only what changed, then sleep until the next frame
+            frame_start = time.perf_counter()
+            self.frame_timer.begin()
+            rects = self.renderer.render(engine)
+            if rects:
+                pygame.display.update(rects)
+            if self.frame_timer.end():
+                pygame.display.set_caption(f'Chess - {self.frame_timer.average_ms:.2f} ms/frame')
+
+            # legal moves for this turn are generated in the frame's spare time
+            if engine.game_active:
+                engine.update_move_table(frame_start + IDLE_SHARE / FPS)
+                if not engine.game_active:
+                    self.game_over()
+            self.clock.tick(FPS)
+
+    def analysis_event(self, event):
         board = self.engine.board
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board.squares[row][col].has_piece():
-                    piece = board.squares[row][col].piece
-                    if piece is not self.dragger.piece:
-                        piece.set_texture(size=80)
-                        img = pygame.image.load(piece.texture)
-                        img_center = col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2
-                        piece.texture_rect = img.get_rect(center=img_center)
-                        surface.blit(img, piece.texture_rect)
-
-    def show_moves(self, surface):
-        theme = self.config.theme
-        if self.dragger.dragging:
-            piece = self.dragger.piece
-            for move in piece.moves:
-                color = theme.moves.light if (move.final.row + move.final.col) % 2 == 0 else theme.moves.dark
-                rect = (move.final.col * SQSIZE, move.final.row * SQSIZE, SQSIZE, SQSIZE)
-                pygame.draw.rect(surface, color, rect)
-
-    def show_last_move(self, surface):
-        theme = self.config.theme
-        if self.engine.board.last_move:
-            initial = self.engine.board.last_move.initial
-            final = self.engine.board.last_move.final
-            for pos in [initial, final]:
-                color = theme.trace.light if (pos.row + pos.col) % 2 == 0 else theme.trace.dark
-                rect = (pos.col * SQSIZE, pos.row * SQSIZE, SQSIZE, SQSIZE)
-                pygame.draw.rect(surface, color, rect)
-
-    def show_hover(self, surface):
-        if self.engine.hovered_sqr:
-            color = (180, 180, 180)
-            rect = (self.engine.hovered_sqr.col * SQSIZE, self.engine.hovered_sqr.row * SQSIZE, SQSIZE, SQSIZE)
-            pygame.draw.rect(surface, color, rect, width=3)
+        # results for a position that is no longer on the board
+        if event.key != board.hash:
+            return
+        if event.depth:
+            self.sidebar.set_eval(event.depth, event.score, event.pv, event.kind == 'done')
+        if event.kind == 'done' and event.play and event.code is not None:
+            self.play_code(event.code)
+
+    def play_code(self, code):
+        board = self.engine.board
+        row, col = divmod(movecode.from_square(code), COLS)
+        self.engine.move(board.squares[row][col].piece, movecode.to_move(code))
+
+    def game_over(self):
+        engine = self.engine
+        self.analysis.cancel()
+        self.store.end_game(engine.result)
+        self.sidebar.set_result(f'{engine.end_reason.capitalize()}  {engine.result}')
+
+    def save_game(self):
+        # ends the game in the store and appends it to game_log.pgn
+        engine = self.engine
+        self.store.end_game(engine.result)
+        gamelog.save_pgn(engine, headers={'Event': 'Casual game', 'Site': 'Chess'},
+                         result=engine.result)
 
     def set_hover(self, row, col):
         if 0 <= row < ROWS and 0 <= col < COLS:
@@ -221,6 +237,10 @@ class Main:
     def change_theme(self):
         self.config.change_theme()
 
+    def on_move(self, piece, move, undo):
+        # sounds for every move played, en passant included
+        self.play_sound(undo.captured is not None)
+
     def play_sound(self, captured=False):
         if captured:
             self.config.capture_sound.play()
@@ -0,0 +1,152 @@
+import pygame
+
+from .const import *
+from .core.square import Square
+from .core import movecode
+
+HOVER_COLOR = (180, 180, 180)
+
+
+class Renderer:
+    """
+    Layered board renderer. The background (squares + rank/file labels) is
+    pre-rendered once per theme; every frame only the squares whose content
+    changed (piece, last-move trace, move highlight, hover) are redrawn, and
+    only their rects are returned for pygame.display.update.
+    """
+
+    def __init__(self, screen, config, textures, dragger, sidebar, text_cache):
+        self.screen = screen
+        self.text = text_cache
+        self.config = config
+        self.textures = textures
+        self.dragger = dragger
+        self.sidebar = sidebar
+        # theme -> pre-rendered board background
+        self.backgrounds = {}
+        # what is currently drawn on each square
+        self.drawn = [[None] * COLS for row in range(ROWS)]
+        self.drawn_theme = None
+        self.drag_rect = None
+        self.sidebar_shown = False
+
+    def invalidate(self):
+        # force a full redraw on the next frame
+        self.drawn_theme = None
+
+    def background(self, theme):
+        surface = self.backgrounds.get(theme)
+        if surface is None:
+            surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.draw_bg(surface, theme)
+            self.backgrounds[theme] = surface
+        return surface
+
+    def draw_bg(self, surface, theme):
+        for row in range(ROWS):
+            for col in range(COLS):
+                color = theme.bg.light if (row + col) % 2 == 0 else theme.bg.dark
+                rect = (col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE)
+                pygame.draw.rect(surface, color, rect)
+
+                if col == 0:
+                    color = theme.bg.dark if row % 2 == 0 else theme.bg.light
+                    lbl = self.text.render(str(ROWS-row), self.config.font, color)
+                    surface.blit(lbl, (5, 5 + row * SQSIZE))
+                if row == 7:
+                    color = theme.bg.dark if (row + col) % 2 == 0 else theme.bg.light
+                    lbl = self.text.render(Square.get_alphacol(col), self.config.font, color)
+                    surface.blit(lbl, (col * SQSIZE + SQSIZE - 20, HEIGHT - 20))
+
+    def render(self, engine):
+        """
+        Brings the screen up to date and returns the list of changed rects.
+        """
+        theme = self.config.theme
+        full = self.drawn_theme is not theme
+        if full:
+            self.drawn = [[None] * COLS for row in range(ROWS)]
+            self.drawn_theme = theme
+            self.sidebar_shown = False
+
+        board = engine.board
+        dragger = self.dragger
+        dragged = dragger.piece if dragger.dragging else None
+
+        # overlays wanted this frame
+        trace = set()
+        last_move = board.last_move
+        if last_move:
+            trace = {(last_move.initial.row, last_move.initial.col),
+                     (last_move.final.row, last_move.final.col)}
+        highlight = set()
+        if dragged is not None:
+            highlight = {divmod(movecode.to_square(code), COLS)
+                         for code in engine.moves_from(dragger.initial_row, dragger.initial_col)}
+        hover = None
+        if engine.hovered_sqr:
+            hover = (engine.hovered_sqr.row, engine.hovered_sqr.col)
+
+        # squares under last frame's dragged piece must be repainted
+        force = set()
+        if self.drag_rect is not None:
+            force = self.squares_in(self.drag_rect)
+
+        rects = []
+        bg = self.background(theme)
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board.squares[row][col].piece
+                if piece is dragged:
+                    piece = None
+                pos = (row, col)
+                state = (piece, pos in trace, pos in highlight, pos == hover)
+                if state != self.drawn[row][col] or pos in force:
+                    rects.append(self.draw_square(bg, theme, row, col, state))
+                    self.drawn[row][col] = state
+
+        # sidebar only when it changed (or the dragged piece was over it)
+        if self.drag_rect is not None and self.drag_rect.colliderect(self.sidebar.rect):
+            self.sidebar_shown = False
+        if self.sidebar.update(engine.move_log) or not self.sidebar_shown:
+            self.sidebar.show()
+            self.sidebar_shown = True
+            rects.append(self.sidebar.rect)
+
+        # dragged piece on top
+        if self.drag_rect is not None:
+            rects.append(self.drag_rect)
+            self.drag_rect = None
+        if dragged is not None:
+            self.drag_rect = dragger.update_blit(self.screen)
+            rects.append(self.drag_rect)
+
+        if full:
+            return [self.screen.get_rect()]
+        return rects
+
+    def draw_square(self, bg, theme, row, col, state):
+        piece, traced, highlighted, hovered = state
+        rect = pygame.Rect(col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE)
+        self.screen.blit(bg, rect, rect)
+
+        if traced:
+            color = theme.trace.light if (row + col) % 2 == 0 else theme.trace.dark
+            pygame.draw.rect(self.screen, color, rect)
+        if highlighted:
+            color = theme.moves.light if (row + col) % 2 == 0 else theme.moves.dark
+            pygame.draw.rect(self.screen, color, rect)
+        if piece is not None:
+            img = self.textures.get(piece, size=80)
+            self.screen.blit(img, img.get_rect(center=rect.center))
+        if hovered:
+            pygame.draw.rect(self.screen, HOVER_COLOR, rect, width=3)
+        return rect
+
+    def squares_in(self, rect):
+        rect = rect.clip(pygame.Rect(0, 0, WIDTH, HEIGHT))
+        if rect.width == 0 or rect.height == 0:
+            return set()
+        return {(row, col)
+                for row in range(rect.top // SQSIZE, (rect.bottom - 1) // SQSIZE + 1)
+                for col in range(rect.left // SQSIZE, (rect.right - 1) // SQSIZE + 1)}
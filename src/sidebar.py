@@ -1,29 +1,113 @@
 import pygame
 from .const import *
 
+BG_COLOR = (50, 50, 50)
+ROW_HEIGHT = 20
+ROWS_TOP = 60
+# engine evaluation panel at the bottom of the sidebar
+EVAL_HEIGHT = 70
+
 class Sidebar:
-    def __init__(self, screen, width, height):
+    def __init__(self, screen, width, height, text_cache):
         self.screen = screen
         self.width = width
         self.height = height
         self.rect = pygame.Rect(width - 200, 0, 200, height) # Assume side panel is 200px
         self.font = pygame.font.SysFont('monospace', 14)
         self.title_font = pygame.font.SysFont('monospace', 24, bold=True)
-    
-    def show_bg(self):
-        pygame.draw.rect(self.screen, (50, 50, 50), self.rect)
-        
-    def show_history(self, move_log):
-        self.show_bg()
-        
-        # Title
-        title = self.title_font.render("Move History", True, (255, 255, 255))
-        self.screen.blit(title, (self.width - 190, 20))
-        
-        # Moves
-        start_y = 60
-        for i, record in enumerate(move_log[-20:]): # Show last 20 moves
-            text = f"{i+1}. {record['notation']}"
+        self.text = text_cache
+        # the panel is composed off-screen and only blitted when shown
+        self.surface = pygame.Surface(self.rect.size).convert()
+        # one rendered line per logged move, appended as the log grows
+        self.lines = []
+        self.visible = (height - ROWS_TOP - EVAL_HEIGHT) // ROW_HEIGHT
+        # index of the first visible line; follows the newest move until scrolled
+        self.scroll = 0
+        self.follow = True
+        # rendered lines of the eval panel
+        self.eval_lines = []
+        self.dirty = True
+
+    def update(self, move_log):
+        """
+        Syncs the panel with 'move_log'; returns True if it needs to be shown again.
+        """
+        if len(move_log) < len(self.lines):
+            # new game
+            self.lines = []
+            self.scroll = 0
+            self.follow = True
+        for i in range(len(self.lines), len(move_log)):
+            text = f"{i+1}. {move_log[i]['notation']}"
             color = (200, 200, 200) if i % 2 == 0 else (255, 255, 255)
-            lbl = self.font.render(text, True, color)
-            self.screen.blit(lbl, (self.width - 190, start_y + i * 20))
+            self.lines.append(self.text.render(text, self.font, color))
+            self.dirty = True
+        if self.follow:
+            self.scroll_to(len(self.lines) - self.visible)
+
+        if self.dirty:
+            self.compose()
+        changed = self.dirty
+        self.dirty = False
+        return changed
+
+    def set_eval(self, depth, score, pv, final=False):
+        """
+        Shows an engine evaluation: 'score' in pawns from white's point of view,
+        'pv' as uci move strings.
+        """
+        from .core.search import MATE, MATE_BOUND
+
+        if abs(score) >= MATE_BOUND:
+            plies = MATE - abs(score)
+            text = f"#{'-' if score < 0 else ''}{int(plies + 1) // 2}"
+        else:
+            text = f"{score + 0.0:+.2f}"
+        state = 'final' if final else 'thinking'
+        self.eval_lines = [
+            self.text.render(f"Eval {text}  d{depth}", self.font, (255, 255, 255)),
+            self.text.render(f"Best {pv[0] if pv else '-'}  ({state})", self.font, (200, 200, 200)),
+            self.text.render(' '.join(pv[1:6]), self.font, (160, 160, 160)),
+        ]
+        self.dirty = True
+
+    def set_result(self, text):
+        # the game is over: the eval panel shows how it ended
+        self.eval_lines = [self.text.render(text, self.font, (255, 255, 255))]
+        self.dirty = True
+
+    def clear_eval(self):
+        if self.eval_lines:
+            self.eval_lines = []
+            self.dirty = True
+
+    def scroll_by(self, lines):
+        self.scroll_to(self.scroll + lines)
+        self.follow = self.scroll >= len(self.lines) - self.visible
+
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self.lines) - self.visible))
+        if first != self.scroll:
+            self.scroll = first
+            self.dirty = True
+
+    def compose(self):
+        surface = self.surface
+        surface.fill(BG_COLOR)
+
+        # Title
+        title = self.text.render("Move History", self.title_font, (255, 255, 255))
+        surface.blit(title, (10, 20))
+
+        # Moves (already rendered, only blitted)
+        for i, line in enumerate(self.lines[self.scroll:self.scroll + self.visible]):
+            surface.blit(line, (10, ROWS_TOP + i * ROW_HEIGHT))
+
+        # Eval panel
+        top = self.height - EVAL_HEIGHT
+        pygame.draw.line(surface, (90, 90, 90), (0, top), (self.rect.width, top))
+        for i, line in enumerate(self.eval_lines):
+            surface.blit(line, (10, top + 8 + i * ROW_HEIGHT))
+
+    def show(self):
+        self.screen.blit(self.surface, self.rect)
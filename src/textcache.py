@@ -0,0 +1,25 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed on (string, font, color, antialias), so a
+    label is only rendered the first time it is drawn. Least recently used
+    entries are dropped beyond max_entries.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, text, font, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
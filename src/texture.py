@@ -0,0 +1,29 @@
+import os
+import pygame
+
+COLORS = ('white', 'black')
+NAMES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+SIZES = (80, 128)
+
+
+def texture_file(color, name, size=80):
+    # piece images live with the UI, engine pieces carry no rendering state
+    return os.path.join(f'assets/images/imgs-{size}px/{color}_{name}.png')
+
+
+class Textures:
+    """
+    Every piece image, loaded once and converted to the display's pixel
+    format. Needs the display mode to be set before it is created.
+    """
+
+    def __init__(self):
+        self.images = {}
+        for size in SIZES:
+            for color in COLORS:
+                for name in NAMES:
+                    img = pygame.image.load(texture_file(color, name, size))
+                    self.images[(color, name, size)] = img.convert_alpha()
+
+    def get(self, piece, size=80):
+        return self.images[(piece.color, piece.name, size)]
@@ -0,0 +1,271 @@
+"""
+Bridge to external UCI engines (e.g. a local Stockfish binary).
+
+UCIEngine drives one engine process over stdin/stdout. UCIPool keeps a few
+of them alive for the whole session and hands queries to whichever is idle,
+so callers get a Future back straight away and never pay process startup
+per query. Positions go over as FEN (Engine.fen) and moves come back as
+uci strings (movecode.from_uci / to_move).
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import queue
+import shutil
+import subprocess
+
+from .core.const import *
+from .core.search import MATE
+from .core import movecode
+
+
+def find_engine(path=None):
+    """
+    Path of the engine binary: 'path', $STOCKFISH_PATH or 'stockfish' on $PATH.
+    """
+    path = path or os.environ.get('STOCKFISH_PATH') or shutil.which('stockfish')
+    if not path:
+        raise FileNotFoundError('no UCI engine found (set STOCKFISH_PATH)')
+    return path
+
+
+def go_command(depth=None, movetime=None, nodes=None):
+    command = 'go'
+    if depth is not None:
+        command += f' depth {depth}'
+    if movetime is not None:
+        command += f' movetime {int(movetime * 1000)}'
+    if nodes is not None:
+        command += f' nodes {nodes}'
+    if command == 'go':
+        command += ' depth 10'
+    return command
+
+
+def position_command(fen, moves=()):
+    command = f'position fen {fen}'
+    if moves:
+        command += ' moves ' + ' '.join(moves)
+    return command
+
+
+def move_for(board, uci):
+    """
+    (piece, Move) on 'board' for a uci move string, ready for Engine.move.
+    """
+    code = movecode.from_uci(uci)
+    row, col = divmod(movecode.from_square(code), COLS)
+    return board.squares[row][col].piece, movecode.to_move(code)
+
+
+class UCIResult:
+
+    def __init__(self):
+        self.bestmove = None
+        self.ponder = None
+        self.depth = 0
+        # pawns from the side to move's point of view; a mate in n plies
+        # scores +-(MATE - n) like Search does, so MATE_BOUND checks apply
+        self.score = 0.0
+        # moves to mate (negative if getting mated), None if no mate was reported
+        self.mate = None
+        self.pv = []
+        self.nodes = 0
+        self.nps = 0
+        self.time = 0.0
+
+    def __str__(self):
+        return f"bestmove {self.bestmove} depth {self.depth} score {self.score:.2f} pv {' '.join(self.pv)}"
+
+    def parse_info(self, line):
+        # fields that don't parse are skipped, engines send odd info lines
+        tokens = line.split()
+        i = 1
+        while i < len(tokens):
+            token = tokens[i]
+            if token == 'pv':
+                self.pv = tokens[i + 1:]
+                break
+            if token in ('depth', 'nodes', 'nps', 'time') and i + 1 < len(tokens):
+                value = parse_int(tokens[i + 1])
+                if value is None:
+                    i += 1
+                    continue
+                if token == 'depth':
+                    self.depth = value
+                elif token == 'nodes':
+                    self.nodes = value
+                elif token == 'nps':
+                    self.nps = value
+                else:
+                    self.time = value / 1000
+                i += 2
+            elif token == 'score' and i + 2 < len(tokens):
+                kind, value = tokens[i + 1], parse_int(tokens[i + 2])
+                if value is None or kind not in ('cp', 'mate'):
+                    i += 1
+                    continue
+                if kind == 'mate':
+                    self.mate = value
+                    plies = 2 * value - 1 if value > 0 else -2 * value
+                    self.score = MATE - plies if value > 0 else -(MATE - plies)
+                else:
+                    self.mate = None
+                    self.score = value / 100
+                i += 3
+            else:
+                i += 1
+
+    def parse_bestmove(self, line):
+        # 'bestmove' alone or 'bestmove (none)' means there is no move
+        tokens = line.split()
+        if len(tokens) > 1 and tokens[1] != '(none)':
+            self.bestmove = tokens[1]
+        if len(tokens) > 3 and tokens[2] == 'ponder':
+            self.ponder = tokens[3]
+
+
+def parse_int(text):
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+class UCIEngine:
+    """
+    One engine process. Not thread-safe: use it from one thread at a time
+    (UCIPool takes care of that).
+    """
+
+    def __init__(self, path=None, options=None):
+        self.path = find_engine(path)
+        self.process = subprocess.Popen([self.path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        self.name = None
+        self.send('uci')
+        for line in self.read_until('uciok'):
+            if line.startswith('id name '):
+                self.name = line[len('id name '):]
+        for name, value in (options or {}).items():
+            self.send(f'setoption name {name} value {value}')
+        self.ready()
+
+    def send(self, command):
+        self.process.stdin.write(command + '\n')
+        self.process.stdin.flush()
+
+    def read_until(self, prefix):
+        # lines up to and including the first one starting with 'prefix'
+        lines = []
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise EOFError(f'{self.path} exited')
+            line = line.strip()
+            lines.append(line)
+            if line.startswith(prefix):
+                return lines
+
+    def ready(self):
+        self.send('isready')
+        self.read_until('readyok')
+
+    def new_game(self):
+        self.send('ucinewgame')
+        self.ready()
+
+    def analyse(self, fen, moves=(), depth=None, movetime=None, nodes=None):
+        """
+        Searches the position (FEN plus optional uci moves) and returns a
+        UCIResult built from the last info line and the bestmove reply.
+        """
+        # position and go are written back to back, no isready round trip
+        self.send(position_command(fen, moves))
+        self.send(go_command(depth, movetime, nodes))
+        result = UCIResult()
+        for line in self.read_until('bestmove'):
+            if line.startswith('info') and not line.startswith('info string'):
+                result.parse_info(line)
+            elif line.startswith('bestmove'):
+                result.parse_bestmove(line)
+        return result
+
+    def stop(self):
+        self.send('stop')
+
+    def quit(self):
+        if self.process.poll() is None:
+            try:
+                self.send('quit')
+                self.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+
+
+class UCIPool:
+    """
+    'size' long-lived engine processes. submit() queues a query and returns
+    a concurrent.futures.Future; queries run as soon as an engine is idle,
+    so several positions can be in flight at once.
+    """
+
+    def __init__(self, path=None, size=2, options=None):
+        self.path = find_engine(path)
+        self.size = size
+        self.options = options
+        self.engines = [UCIEngine(self.path, options) for i in range(size)]
+        self.idle = queue.Queue()
+        for engine in self.engines:
+            self.idle.put(engine)
+        self.executor = ThreadPoolExecutor(max_workers=size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, fen, moves=(), depth=None, movetime=None, nodes=None):
+        return self.executor.submit(self._analyse, fen, moves, depth, movetime, nodes)
+
+    def submit_engine(self, engine, depth=None, movetime=None, nodes=None):
+        # current position of a chess Engine
+        return self.submit(engine.fen(), (), depth, movetime, nodes)
+
+    def analyse(self, fen, moves=(), depth=None, movetime=None, nodes=None):
+        return self.submit(fen, moves, depth, movetime, nodes).result()
+
+    def _analyse(self, fen, moves, depth, movetime, nodes):
+        engine = self.idle.get()
+        if engine is None:
+            # every engine is gone; pass the news on to the next caller
+            self.idle.put(None)
+            raise EOFError('no UCI engine left in the pool')
+        try:
+            return engine.analyse(fen, moves, depth, movetime, nodes)
+        except (EOFError, OSError):
+            # a crashed engine is replaced, not handed to the next query
+            engine = self._restart(engine)
+            raise
+        finally:
+            # the engine (or its replacement) goes back on every exit
+            if engine is not None:
+                self.idle.put(engine)
+            elif not self.engines:
+                self.idle.put(None)
+
+    def _restart(self, engine):
+        # new process in place of 'engine'; None if it can't be started
+        engine.quit()
+        self.engines.remove(engine)
+        try:
+            engine = UCIEngine(self.path, self.options)
+        except (EOFError, OSError):
+            return None
+        self.engines.append(engine)
+        return engine
+
+    def close(self):
+        self.executor.shutdown()
+        for engine in self.engines:
+            engine.quit()
@@ -0,0 +1,260 @@
+"""
+Headless UCI front end for the built-in Engine, for engine-vs-engine
+matches and other UCI tools (no pygame is imported):
+
+    python -m src.uciserver
+
+Supports uci, isready, setoption (Hash, BookFile), ucinewgame, position
+[startpos | fen ...] [moves ...], go [depth | movetime | nodes | wtime/btime
+... | searchmoves ... | ponder | infinite], stop, ponderhit and quit. The
+search runs on its own thread so stop is answered while it thinks; every
+completed iteration is reported as an info line with depth, score, nodes,
+nps, time and pv. After go infinite or go ponder, bestmove is held back
+until stop (or ponderhit) even if the search ends first. With a Polyglot
+BookFile set, positions in the book are answered with a book move at once
+(except for go infinite and go ponder). Malformed commands are reported on
+an info string line and otherwise ignored.
+"""
+import sys
+import threading
+import time
+
+from .core.engine import Engine
+from .core.fen import START_FEN
+from .core.search import Search, MATE, MATE_BOUND
+from .core.transposition import TranspositionTable
+from .core import movecode
+
+NAME = 'Chess'
+AUTHOR = 'Vermaman2003'
+DEFAULT_HASH = 16
+# fraction of the remaining clock spent on one move when no movestogo is given
+MOVES_TO_GO = 30
+# go arguments followed by a number
+GO_NUMBERS = ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo', 'nodes')
+GO_KEYWORDS = GO_NUMBERS + ('searchmoves', 'ponder', 'infinite', 'mate')
+
+
+def score_string(score):
+    # centipawns, or moves to mate
+    if abs(score) >= MATE_BOUND:
+        plies = MATE - abs(score)
+        moves = int(plies + 1) // 2
+        return f'mate {moves if score > 0 else -moves}'
+    return f'cp {round(score * 100)}'
+
+
+def legal_code(engine, uci):
+    """
+    Legal move code of the uci move 'uci' in the engine's position
+    (ValueError if it can't be parsed or isn't legal there).
+    """
+    code = movecode.from_uci(uci)
+    for legal in engine.legal_moves():
+        if movecode.key(legal) == movecode.key(code) \
+                and movecode.promotion(legal) == movecode.promotion(code):
+            return legal
+    raise ValueError(f'illegal move: {uci}')
+
+
+class UCIServer:
+
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.engine = Engine(DEFAULT_HASH)
+        self.thread = None
+        self.stop_event = None
+        # arguments of the last position command that could be set up
+        self.position_args = None
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def loop(self, input=sys.stdin):
+        for line in input:
+            if not self.command(line.strip()):
+                break
+        self.stop()
+
+    def command(self, line):
+        """
+        Handles one input line; returns False on quit.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        name, args = tokens[0], tokens[1:]
+        if name == 'uci':
+            self.send(f'id name {NAME}')
+            self.send(f'id author {AUTHOR}')
+            self.send(f'option name Hash type spin default {DEFAULT_HASH} min 1 max 1024')
+            self.send('option name BookFile type string default <empty>')
+            self.send('uciok')
+        elif name == 'isready':
+            self.send('readyok')
+        elif name == 'setoption':
+            self.setoption(args)
+        elif name == 'ucinewgame':
+            self.stop()
+            self.engine.tt.clear()
+        elif name == 'position':
+            self.stop()
+            self.position(args)
+        elif name == 'go':
+            self.stop()
+            self.go(args)
+        elif name in ('stop', 'ponderhit'):
+            # on ponderhit the move found while pondering is played
+            self.stop()
+        elif name == 'quit':
+            return False
+        # anything else (debug, register, ...) is ignored
+        return True
+
+    def setoption(self, args):
+        # setoption name <id> value <x>
+        if 'name' not in args or 'value' not in args:
+            return
+        option = ' '.join(args[args.index('name') + 1:args.index('value')])
+        value = ' '.join(args[args.index('value') + 1:])
+        if option.lower() == 'hash':
+            try:
+                size = int(value)
+            except ValueError:
+                self.send(f'info string invalid Hash value: {value}')
+                return
+            self.stop()
+            self.engine.tt = TranspositionTable(size)
+            self.engine.tt_size_mb = size
+        elif option.lower() == 'bookfile':
+            if value and value != '<empty>':
+                try:
+                    self.engine.open_book(value)
+                except OSError as e:
+                    self.send(f'info string cannot open book: {e}')
+            else:
+                self.engine.close_book()
+
+    def position(self, args):
+        if not args:
+            return
+        try:
+            self.set_position(args)
+        except ValueError as e:
+            self.send(f'info string {e}')
+            # back to the last good position (set up again, so the
+            # repetition history is rebuilt as well)
+            if self.position_args is not None:
+                self.set_position(self.position_args)
+            else:
+                self.engine.set_fen(START_FEN)
+            return
+        self.position_args = args
+
+    def set_position(self, args):
+        moves = []
+        if 'moves' in args:
+            moves = args[args.index('moves') + 1:]
+            args = args[:args.index('moves')]
+        if args[0] == 'startpos':
+            fen = START_FEN
+        elif args[0] == 'fen':
+            fen = ' '.join(args[1:])
+        else:
+            raise ValueError(f'invalid position: {" ".join(args)}')
+
+        engine = self.engine
+        engine.set_fen(fen)
+        # played as game moves so the clocks and repetition history follow
+        for uci in moves:
+            engine.make_code(legal_code(engine, uci))
+
+    def go(self, args):
+        options = {}
+        root_moves = None
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            i += 1
+            if arg in ('infinite', 'ponder'):
+                options[arg] = True
+            elif arg == 'searchmoves':
+                root_moves = []
+                while i < len(args) and args[i] not in GO_KEYWORDS:
+                    try:
+                        root_moves.append(legal_code(self.engine, args[i]))
+                    except ValueError as e:
+                        self.send(f'info string {e}')
+                    i += 1
+            elif arg in GO_NUMBERS and i < len(args):
+                try:
+                    options[arg] = int(args[i])
+                    i += 1
+                except ValueError:
+                    self.send(f'info string invalid {arg} value: {args[i]}')
+            # unknown or malformed arguments are skipped
+
+        # bestmove waits for stop
+        hold = options.get('infinite', False) or options.get('ponder', False)
+        max_depth = options.get('depth', 64)
+        node_limit = options.get('nodes')
+        time_limit = None
+        if 'movetime' in options:
+            time_limit = options['movetime'] / 1000
+        elif not hold:
+            side = 'w' if self.engine.next_player == 'white' else 'b'
+            if f'{side}time' in options:
+                remaining = options[f'{side}time'] / 1000
+                increment = options.get(f'{side}inc', 0) / 1000
+                moves_to_go = max(options.get('movestogo', MOVES_TO_GO), 1)
+                time_limit = min(remaining / moves_to_go + increment / 2, remaining / 2)
+
+        if not hold and not root_moves:
+            code = self.engine.book_move()
+            if code is not None:
+                self.send('info string book move')
+                self.send(f'bestmove {movecode.uci(code)}')
+                return
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.search,
+                                       args=(max_depth, time_limit, node_limit, root_moves or None,
+                                             hold, self.stop_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def search(self, max_depth, time_limit, node_limit, root_moves, hold, stop_event):
+        engine = self.engine
+        search = Search(engine, max_depth, time_limit, node_limit, engine.tt,
+                        root_moves=root_moves, stop_event=stop_event, info=self.info)
+        result = search.run()
+        self.info(result)
+        if hold:
+            stop_event.wait()
+        bestmove = movecode.uci(result.code) if result.code is not None else '0000'
+        self.send(f'bestmove {bestmove}')
+
+    def info(self, result):
+        elapsed = max(result.time, 1e-6)
+        pv = ' '.join(movecode.uci(code) for code in result.pv)
+        self.send(f'info depth {result.depth} score {score_string(result.score)} '
+                  f'nodes {result.nodes} nps {int(result.nodes / elapsed)} '
+                  f'time {int(result.time * 1000)} pv {pv}')
+
+    def stop(self):
+        # ends the running search; its bestmove is sent before this returns
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+
+def main():
+    UCIServer().loop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Minimal UCI engine for the src.uci tests. It answers the handshake and
+replies to go with one info line and a fixed bestmove:
+
+    white to move   info depth <depth> score cp 25 ... pv e2e4 e7e5
+                    bestmove e2e4 ponder e7e5
+    black to move   info depth <depth> score cp -25 ... pv e7e5
+                    bestmove e7e5
+
+The side to move is read from the FEN and flipped for every move after
+'moves'. A position on an empty board (8/8/8/8/8/8/8/8) makes it exit without a
+reply, as a crashed engine would. A position with the two kings alone on
+a1 and h1 (8/8/8/8/8/8/8/K6k) gets a malformed info line and a bare
+'bestmove'.
+"""
+import sys
+
+EMPTY_BOARD = '8/8/8/8/8/8/8/8'
+GARBAGE_BOARD = '8/8/8/8/8/8/8/K6k'
+
+
+def send(line):
+    sys.stdout.write(line + '\n')
+    sys.stdout.flush()
+
+
+def main():
+    fen = ''
+    black = False
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        name = tokens[0]
+        if name == 'uci':
+            send('id name Fake UCI')
+            send('id author tests')
+            send('option name Hash type spin default 16 min 1 max 1024')
+            send('uciok')
+        elif name == 'isready':
+            send('readyok')
+        elif name == 'position':
+            fen = ' '.join(tokens[1:])
+            moves = tokens[tokens.index('moves') + 1:] if 'moves' in tokens else []
+            black = (' b ' in fen) != (len(moves) % 2 == 1)
+            send(f'info string {line.strip()}')
+        elif name == 'go':
+            if EMPTY_BOARD in fen:
+                sys.exit(1)
+            if GARBAGE_BOARD in fen:
+                send('info depth x seldepth score cp ?? nodes 12 nps time pv')
+                send('bestmove')
+                continue
+            depth = int(tokens[tokens.index('depth') + 1]) if 'depth' in tokens else 1
+            if black:
+                send(f'info depth {depth} score cp -25 nodes 1000 nps 100000 time 10 pv e7e5')
+                send('bestmove e7e5')
+            else:
+                send(f'info depth {depth} score cp 25 nodes 1000 nps 100000 time 10 pv e2e4 e7e5')
+                send('bestmove e2e4 ponder e7e5')
+        elif name == 'quit':
+            break
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from src.core.engine import Engine
+from src.core.perft import POSITIONS
+from src.core.evaluation import evaluate
+
+try:
+    import numpy as np
+    from src.batch import encode, encode_board, evaluate_batch, planes, PositionBatch
+except ImportError:
+    np = None
+
+
+def random_boards(count, seed=3):
+    # positions reached by random playouts from the perft positions
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        for name, fen, expected in POSITIONS:
+            engine = Engine()
+            engine.set_fen(fen)
+            for ply in range(rng.randrange(30)):
+                moves = engine.legal_moves()
+                if not moves:
+                    break
+                engine.make_code(rng.choice(moves))
+            boards.append(engine.board)
+    return boards
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class BatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_boards(200)
+
+    def test_matches_evaluate(self):
+        scores = evaluate_batch(encode(self.boards))
+        self.assertEqual(scores.shape, (len(self.boards),))
+        for board, score in zip(self.boards, scores):
+            self.assertAlmostEqual(score, evaluate(board), places=12)
+
+    def test_position_batch(self):
+        batch = PositionBatch()
+        for board in self.boards[:5]:
+            batch.add(board)
+        self.assertEqual(len(batch), 5)
+        encoded = batch.array()
+        self.assertEqual(encoded.dtype, np.uint8)
+        self.assertEqual(encoded[3].tobytes(), encode_board(self.boards[3]))
+        batch.clear()
+        self.assertEqual(len(batch), 0)
+
+    def test_planes(self):
+        encoded = encode(self.boards[:10])
+        one_hot = planes(encoded)
+        self.assertEqual(one_hot.shape, (10, 12, 64))
+        # one plane per occupied square, none for empty ones
+        np.testing.assert_array_equal(one_hot.sum(axis=1), (encoded > 0).astype(np.uint8))
+
+
+if __name__ == '__main__':
+    unittest.main()
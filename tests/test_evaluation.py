@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from src.core.engine import Engine
+from src.core.perft import POSITIONS
+from src.core.evaluation import compute_scores, evaluate, MAX_PHASE
+from src.core.fen import START_FEN
+
+
+def scores(board):
+    return board.mg, board.eg, board.phase
+
+
+class IncrementalScoreTest(unittest.TestCase):
+
+    def test_random_playouts(self):
+        rng = random.Random(7)
+        for name, fen, expected in POSITIONS:
+            with self.subTest(position=name):
+                engine = Engine()
+                engine.set_fen(fen)
+                board = engine.board
+                for playout in range(8):
+                    undos = []
+                    before = []
+                    for ply in range(40):
+                        moves = engine.legal_moves()
+                        if not moves:
+                            break
+                        before.append(scores(board))
+                        undos.append(board.make_code(rng.choice(moves)))
+                        engine.next_turn()
+                        self.assertEqual(scores(board), compute_scores(board))
+                    # unmaking restores every earlier value exactly
+                    while undos:
+                        board.unmake_move(undos.pop())
+                        engine.next_turn()
+                        self.assertEqual(scores(board), before.pop())
+
+    def test_start_position(self):
+        engine = Engine()
+        self.assertEqual(scores(engine.board), (0, 0, MAX_PHASE))
+        self.assertEqual(evaluate(engine.board), 0.0)
+
+    def test_mirrored_positions(self):
+        # colors swapped and the board flipped: the same score, negated
+        for fen, mirrored in (
+                ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+                 'r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R b KQkq - 0 1'),
+                ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+                 '8/4p1p1/8/1r3P1K/kp5R/3P4/2P5/8 b - - 0 1')):
+            engine = Engine()
+            engine.set_fen(fen)
+            score = evaluate(engine.board)
+            engine.set_fen(mirrored)
+            self.assertAlmostEqual(evaluate(engine.board), -score)
+            self.assertNotEqual(score, 0.0)
+
+    def test_set_fen_recomputes(self):
+        engine = Engine()
+        engine.set_fen(POSITIONS[1][1])
+        engine.set_fen(START_FEN)
+        self.assertEqual(scores(engine.board), compute_scores(engine.board))
+
+
+if __name__ == '__main__':
+    unittest.main()
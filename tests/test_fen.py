@@ -0,0 +1,98 @@
+import unittest
+
+from src.core.engine import Engine
+from src.core.board import Board
+from src.core.bitboard import Bitboards
+from src.core.perft import POSITIONS
+from src.core.fen import parse_fen, read_fen, write_fen, parse_epd, read_epd, write_epd, \
+    START_FEN
+
+MALFORMED = [
+    '',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNRR w KQkq - 0 1',
+    'rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQxq - 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e9 0 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - zero 1',
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1 extra',
+    # en passant target on the wrong rank for the side to move
+    'rnbqkbnr/pppp1ppp/8/8/4p3/8/PPPPPPPP/RNBQKBNR w KQkq e3 0 1',
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e6 0 1',
+    'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e4 0 1',
+]
+
+
+class FENTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for name, fen, expected in POSITIONS:
+            with self.subTest(position=name):
+                engine = Engine()
+                engine.set_fen(fen)
+                self.assertEqual(engine.fen(), fen)
+                placement, next_player, castling, ep_square, halfmove, fullmove = parse_fen(fen)
+                self.assertEqual(write_fen(read_fen(fen), halfmove, fullmove), fen)
+                board = read_fen(fen).to_board()
+                self.assertEqual(write_fen(Bitboards.from_board(board, next_player),
+                                           halfmove, fullmove), fen)
+
+    def test_missing_fields_default(self):
+        engine = Engine()
+        engine.set_fen(START_FEN.split(' ', 1)[0])
+        self.assertEqual(engine.fen(), START_FEN.split(' ', 1)[0] + ' w - - 0 1')
+
+    def test_malformed(self):
+        for fen in MALFORMED:
+            with self.subTest(fen=fen):
+                with self.assertRaises(ValueError):
+                    Engine().set_fen(fen)
+
+    def test_ep_rank_checked_by_set_position(self):
+        # d3 is only a target with black to move
+        with self.assertRaises(ValueError):
+            Board().set_position([(4, 'black', 'king'), (60, 'white', 'king')], 0, 43, 'white')
+
+    def test_castling_without_rook(self):
+        with self.assertRaises(ValueError):
+            Engine().set_fen('4k3/8/8/8/8/8/8/4K3 w K - 0 1')
+
+
+class EPDTest(unittest.TestCase):
+
+    LINE = ('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - '
+            'bm Bb5 Bc4; id "test; one"; c0 "quiet move"; hmvc 2; fmvn 3; noop;')
+
+    def test_opcodes(self):
+        record = parse_epd(self.LINE)
+        self.assertEqual(record.position,
+                         'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq -')
+        self.assertEqual(record.ops, {'bm': 'Bb5 Bc4', 'id': 'test; one', 'c0': 'quiet move',
+                                      'hmvc': '2', 'fmvn': '3', 'noop': ''})
+        self.assertEqual(record.id, 'test; one')
+        # the clock opcodes become the FEN move clocks
+        self.assertEqual(record.fen, record.position + ' 2 3')
+        Engine().set_fen(record.fen)
+
+    def test_write_and_read_back(self):
+        record = parse_epd(self.LINE)
+        line = write_epd(record.fen, record.ops)
+        self.assertEqual(str(record), line)
+        again = parse_epd(line)
+        self.assertEqual(again.position, record.position)
+        self.assertEqual(again.ops, record.ops)
+
+    def test_read_skips_blank_and_comment_lines(self):
+        lines = ['# suite', '', self.LINE, '   ', START_FEN.rsplit(' ', 2)[0]]
+        records = list(read_epd(lines))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1].ops, {})
+        with self.assertRaises(ValueError):
+            parse_epd('8/8/8/8 w')
+
+
+if __name__ == '__main__':
+    unittest.main()
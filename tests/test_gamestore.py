@@ -0,0 +1,134 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.gamestore import GameStore, GameStoreWriter, convert_csv, INDEX, RECORD_SIZE
+from src.analyze_log import analyze
+from src.core.fen import START_FEN
+from src.core import movecode
+
+SAMPLE_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'game_log.csv')
+FEN = '4k3/8/8/8/8/8/8/R3K3 w - - 0 1'
+
+
+class GameStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'games.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_games(self):
+        # three games: a finished one, one from a FEN and an open one
+        with GameStoreWriter(self.path) as writer:
+            writer.begin_game(start_ms=1000)
+            writer.add_move('white', 'pawn', movecode.from_uci('e2e4'), 1500)
+            writer.add_move('black', 'pawn', movecode.from_uci('e7e5'), 2500)
+            writer.end_game('1-0')
+            writer.begin_game(FEN, start_ms=5000)
+            writer.add_move('white', 'rook', movecode.from_uci('a1a8'), 6000)
+            writer.end_game('*')
+            writer.begin_game(start_ms=9000)
+            writer.add_move('white', 'knight', movecode.from_uci('g1f3'), 9100)
+
+    def summary(self):
+        with GameStore(self.path) as store:
+            return [(game.number, game.fen, game.result, [move.uci() for move in game.moves])
+                    for game in store]
+
+    EXPECTED = [
+        (0, START_FEN, '1-0', ['e2e4', 'e7e5']),
+        (1, FEN, '*', ['a1a8']),
+        (2, START_FEN, '*', ['g1f3']),
+    ]
+
+    def test_round_trip(self):
+        self.write_games()
+        self.assertEqual(self.summary(), self.EXPECTED)
+        with GameStore(self.path) as store:
+            game = store[-1]
+            self.assertEqual(game.start_ms, 9000)
+            self.assertEqual((game.moves[0].color, game.moves[0].piece, game.moves[0].ms),
+                             ('white', 'knight', 100))
+
+    def test_torn_last_record(self):
+        self.write_games()
+        # a crash in the middle of writing a record
+        with open(self.path, 'ab') as f:
+            f.write(b'\x02\x01\x02')
+        self.assertEqual(self.summary(), self.EXPECTED)
+
+        # the writer drops the partial record and appends after it
+        with GameStoreWriter(self.path) as writer:
+            self.assertEqual(os.path.getsize(self.path) % RECORD_SIZE, 0)
+            writer.begin_game(start_ms=20000)
+            writer.add_move('white', 'pawn', movecode.from_uci('d2d4'), 20000)
+        games = self.summary()
+        self.assertEqual(games[:3], self.EXPECTED)
+        self.assertEqual(games[3][0], 3)
+        self.assertEqual(games[3][3], ['d2d4'])
+
+    def test_missing_index(self):
+        self.write_games()
+        os.remove(self.path + '.idx')
+        self.assertEqual(self.summary(), self.EXPECTED)
+        # the writer puts it back
+        GameStoreWriter(self.path).close()
+        self.assertEqual(os.path.getsize(self.path + '.idx'), 3 * INDEX.size)
+
+    def test_stale_index(self):
+        self.write_games()
+        index = self.path + '.idx'
+        with open(index, 'rb') as f:
+            offsets = f.read()
+
+        # behind the data: the scan picks up the games after the last entry
+        with open(index, 'wb') as f:
+            f.write(offsets[:INDEX.size])
+        self.assertEqual(self.summary(), self.EXPECTED)
+
+        # entries past the end of the data are dropped
+        with open(index, 'wb') as f:
+            f.write(offsets + INDEX.pack(1 << 40))
+        self.assertEqual(self.summary(), self.EXPECTED)
+
+        # an entry that isn't a game record: rebuilt from the data
+        with open(index, 'wb') as f:
+            f.write(offsets[:INDEX.size] + INDEX.pack(INDEX.unpack_from(offsets, 0)[0]
+                                                      + RECORD_SIZE))
+        self.assertEqual(self.summary(), self.EXPECTED)
+
+        GameStoreWriter(self.path).close()
+        with open(index, 'rb') as f:
+            self.assertEqual(f.read(), offsets)
+
+    def test_convert_matches_csv_analysis(self):
+        # the sample log twice over, so the boundary between games is tested too
+        log = os.path.join(self.dir, 'log.csv')
+        with open(SAMPLE_LOG, newline='') as src, open(log, 'w', newline='') as dst:
+            rows = list(csv.DictReader(src))
+            writer = csv.DictWriter(dst, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows + rows)
+
+        games, moves, skipped = convert_csv(log, self.path)
+        self.assertEqual(games, 2)
+        self.assertEqual(moves, 2 * len(rows))
+
+        outputs = []
+        for source in (log, self.path):
+            output = os.path.join(self.dir, os.path.basename(source) + '.out')
+            stats = analyze(source, output, depth=1)
+            self.assertEqual((stats['games'], stats['moves']), (games, moves))
+            with open(output) as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from src.core.engine import Engine
+from src.core.search import Search, INF
+from src.core.history import PositionHistory, FIFTY_MOVES
+from src.core import movecode
+
+KNIGHT_SHUFFLE = ['g1f3', 'g8f6', 'f3g1', 'f6g8']
+# white queen up; black can only hope for a draw
+QUEEN_UP = '7k/8/8/8/8/8/8/K2Q4 b - - 0 1'
+
+
+def play(engine, moves):
+    for uci in moves:
+        code = movecode.from_uci(uci)
+        for legal in engine.legal_moves():
+            if movecode.key(legal) == movecode.key(code):
+                engine.make_code(legal)
+                break
+        else:
+            raise ValueError(f'illegal move: {uci}')
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_threefold_by_knight_shuffle(self):
+        engine = Engine()
+        play(engine, KNIGHT_SHUFFLE)
+        self.assertEqual(engine.history.repetitions(), 1)
+        self.assertTrue(engine.history.is_repetition())
+        self.assertFalse(engine.history.is_threefold())
+        engine.update_move_table()
+        self.assertTrue(engine.game_active)
+
+        play(engine, KNIGHT_SHUFFLE)
+        self.assertTrue(engine.history.is_threefold())
+        engine.update_move_table()
+        self.assertFalse(engine.game_active)
+        self.assertEqual((engine.result, engine.end_reason), ('1/2-1/2', 'threefold repetition'))
+
+    def test_other_side_to_move_is_not_a_repetition(self):
+        engine = Engine()
+        # same placement after 3 plies, but with black to move
+        play(engine, ['g1f3', 'g8f6', 'f3g1'])
+        self.assertFalse(engine.history.is_repetition())
+
+    def test_fifty_moves(self):
+        engine = Engine()
+        engine.set_fen('4k3/8/8/8/8/8/4P3/R3K3 w - - 98 80')
+        play(engine, ['a1a2'])
+        self.assertEqual(engine.halfmove_clock, 99)
+        engine.update_move_table()
+        self.assertTrue(engine.game_active)
+        play(engine, ['e8d8'])
+        self.assertEqual(engine.halfmove_clock, FIFTY_MOVES)
+        self.assertTrue(engine.history.is_fifty_moves())
+        engine.update_move_table()
+        self.assertEqual((engine.result, engine.end_reason), ('1/2-1/2', 'fifty-move rule'))
+
+    def test_pawn_move_and_capture_reset_the_clock(self):
+        engine = Engine()
+        engine.set_fen('4k3/8/8/3p4/8/8/4P3/R3K3 w - - 90 80')
+        play(engine, ['e2e4'])
+        self.assertEqual(engine.halfmove_clock, 0)
+        play(engine, ['e8d7', 'a1a3'])
+        self.assertEqual(engine.halfmove_clock, 2)
+        play(engine, ['d5e4'])
+        self.assertEqual(engine.halfmove_clock, 0)
+        # positions before the reset can't repeat
+        self.assertEqual(len(engine.history.recent()), 1)
+
+    def test_recent(self):
+        history = PositionHistory(1)
+        for key, irreversible in ((2, False), (3, True), (4, False), (3, False)):
+            history.push(key, irreversible)
+        recent = history.recent()
+        self.assertEqual(recent.keys, [3, 4, 3])
+        self.assertEqual(recent.clocks, [0, 1, 2])
+        history.pop()
+        self.assertEqual(history.halfmove_clock, 1)
+
+
+class SearchDrawTest(unittest.TestCase):
+
+    def test_repetition_scores_as_draw(self):
+        engine = Engine()
+        engine.set_fen(QUEEN_UP)
+        lost = Search(engine, max_depth=2).run()
+        self.assertLess(lost.score, -5)
+
+        # black king and white queen shuffle back to the start position;
+        # Kg8 now repeats the position after black's first move
+        play(engine, ['h8g8', 'd1d2', 'g8h8', 'd2d1'])
+        result = Search(engine, max_depth=2).run()
+        self.assertEqual(result.score, 0.0)
+        self.assertEqual(movecode.uci(result.code), 'h8g8')
+
+    def test_draw_nodes(self):
+        engine = Engine()
+        engine.set_fen(QUEEN_UP)
+        # a repeated position below the root is a draw without searching it
+        play(engine, ['h8g8', 'd1d2', 'g8h8', 'd2d1'])
+        search = Search(engine)
+        self.assertEqual(search.negamax(3, 1, -INF, INF), (0.0, []))
+        # the fifty-move rule too
+        engine.set_fen(QUEEN_UP.replace(' 0 1', f' {FIFTY_MOVES} 90'))
+        search = Search(engine)
+        self.assertEqual(search.negamax(3, 1, -INF, INF), (0.0, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import time
+import unittest
+
+from src.core.engine import Engine
+from src.core.perft import POSITIONS
+from src.core import movecode
+
+
+def engine_at(fen):
+    engine = Engine()
+    engine.set_fen(fen)
+    return engine
+
+
+def table_codes(engine):
+    return sorted(code for codes in engine.move_table.values() for code in codes)
+
+
+class MoveTableTest(unittest.TestCase):
+
+    def test_matches_legal_moves(self):
+        for name, fen, expected in POSITIONS:
+            with self.subTest(position=name):
+                engine = engine_at(fen)
+                self.assertTrue(engine.update_move_table())
+                self.assertEqual(table_codes(engine), sorted(engine.legal_moves()))
+                self.assertTrue(engine.game_active)
+
+    def test_deadline_resumes(self):
+        for name, fen, expected in POSITIONS:
+            with self.subTest(position=name):
+                engine = engine_at(fen)
+                # an expired deadline: nothing is checked on the first call
+                self.assertFalse(engine.update_move_table(time.perf_counter()))
+                self.assertEqual(engine.move_table, {})
+                while not engine.update_move_table(time.perf_counter() + 1e-5):
+                    pass
+                self.assertEqual(table_codes(engine), sorted(engine.legal_moves()))
+                self.assertEqual(engine.move_keys, {movecode.key(code) for code in engine.legal_moves()})
+                self.assertTrue(engine.game_active)
+
+    def test_lookup_finishes_partial_table(self):
+        engine = engine_at(POSITIONS[1][1])
+        engine.update_move_table(time.perf_counter())
+        # e1 king: castling both ways plus d1 and f1
+        codes = engine.moves_from(7, 4)
+        self.assertEqual(sorted(movecode.uci(code) for code in codes),
+                         ['e1c1', 'e1d1', 'e1f1', 'e1g1'])
+        self.assertEqual(table_codes(engine), sorted(engine.legal_moves()))
+
+    def test_table_follows_position(self):
+        engine = Engine()
+        engine.update_move_table()
+        self.assertEqual(len(table_codes(engine)), 20)
+        engine.make_code(movecode.from_uci('e2e4'))
+        engine.update_move_table()
+        # black's pieces are on the first two rows
+        self.assertEqual(len(table_codes(engine)), 20)
+        self.assertTrue(all(code & 0x3F < 16 for code in table_codes(engine)))
+
+    def test_checkmate(self):
+        # fool's mate: white is mated
+        engine = Engine()
+        for uci in ('f2f3', 'e7e5', 'g2g4', 'd8h4'):
+            engine.make_code(movecode.from_uci(uci))
+        self.assertTrue(engine.update_move_table())
+        self.assertEqual(engine.move_table, {})
+        self.assertFalse(engine.game_active)
+        self.assertEqual(engine.result, '0-1')
+        self.assertEqual(engine.end_reason, 'checkmate')
+
+        engine = engine_at('6k1/5ppp/8/8/8/8/8/R3K3 w - - 0 1')
+        engine.make_code(movecode.from_uci('a1a8'))
+        engine.update_move_table()
+        self.assertEqual((engine.result, engine.end_reason), ('1-0', 'checkmate'))
+
+    def test_stalemate(self):
+        engine = engine_at('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1')
+        self.assertTrue(engine.update_move_table())
+        self.assertFalse(engine.game_active)
+        self.assertEqual(engine.result, '1/2-1/2')
+        self.assertEqual(engine.end_reason, 'stalemate')
+
+    def test_end_found_through_deadline(self):
+        engine = engine_at('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1')
+        engine.update_move_table(time.perf_counter())
+        self.assertTrue(engine.game_active)
+        while not engine.update_move_table(time.perf_counter() + 1e-5):
+            pass
+        self.assertEqual(engine.end_reason, 'stalemate')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from src.core.perft import setup, POSITIONS
+from src.core import parallel
+
+FENS = {name: fen for name, fen, expected in POSITIONS}
+
+
+class ParallelSearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = parallel.make_pool(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_matches_single_process_score(self):
+        # the shared root alpha only prunes moves that can't be best
+        for name in ('start', 'kiwipete', 'middlegame'):
+            with self.subTest(position=name):
+                single = setup(FENS[name]).search(max_depth=3, use_book=False)
+                engine = setup(FENS[name])
+                result = parallel.parallel_search(engine, self.pool, 3, max_depth=3)
+                self.assertEqual(result.depth, 3)
+                self.assertAlmostEqual(result.score, single.score)
+                self.assertIn(result.code, engine.legal_moves())
+                self.assertEqual(result.pv[0], result.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
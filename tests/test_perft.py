@@ -0,0 +1,36 @@
+import unittest
+
+from src.core.perft import POSITIONS, setup
+from src.core import movecode
+
+DEPTH = 3
+
+
+class PerftTest(unittest.TestCase):
+
+    def test_reference_counts(self):
+        for name, fen, expected in POSITIONS:
+            for depth in range(1, DEPTH + 1):
+                with self.subTest(position=name, depth=depth):
+                    self.assertEqual(setup(fen).perft(depth), expected[depth - 1])
+
+    def test_position_unchanged(self):
+        # perft makes and unmakes every move; the board ends where it started
+        for name, fen, expected in POSITIONS:
+            with self.subTest(position=name):
+                engine = setup(fen)
+                key = engine.board.hash
+                engine.perft(2)
+                self.assertEqual(engine.fen(), fen)
+                self.assertEqual(engine.board.hash, key)
+
+    def test_divide(self):
+        name, fen, expected = POSITIONS[1]
+        counts = setup(fen).perft(2, divide=True)
+        self.assertEqual(len(counts), expected[0])
+        self.assertEqual(sum(counts.values()), expected[1])
+        self.assertEqual(set(counts), {movecode.uci(code) for code in setup(fen).legal_moves()})
+
+
+if __name__ == '__main__':
+    unittest.main()
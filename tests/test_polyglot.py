@@ -0,0 +1,157 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.core.engine import Engine
+from src.core.polyglot import Book, BookEntry, polyglot_key, encode_move, decode_move, \
+    book_move, write_book
+from src.core import movecode
+
+# keys from the Polyglot book format description
+REFERENCE_KEYS = [
+    ([], 0x463b96181691fc9c),
+    (['e2e4'], 0x823c9b50fd114196),
+    (['e2e4', 'd7d5'], 0x0756b94461c50fb0),
+    (['e2e4', 'd7d5', 'e4e5'], 0x662fafb965db29d4),
+    (['e2e4', 'd7d5', 'e4e5', 'f7f5'], 0x22a48b5a8e47ff78),
+    (['e2e4', 'd7d5', 'e4e5', 'f7f5', 'e1e2'], 0x652a607ca3f242c1),
+    (['e2e4', 'd7d5', 'e4e5', 'f7f5', 'e1e2', 'e8f7'], 0x00fdd303c946bdd9),
+    (['a2a4', 'b7b5', 'h2h4', 'b5b4', 'c2c4'], 0x3c8123ea7b067637),
+    (['a2a4', 'b7b5', 'h2h4', 'b5b4', 'c2c4', 'b4c3', 'a1a3'], 0x5c3f9b829b279560),
+]
+
+
+def legal_code(engine, uci):
+    code = movecode.from_uci(uci)
+    for legal in engine.legal_moves():
+        if movecode.key(legal) == movecode.key(code) \
+                and movecode.promotion(legal) == movecode.promotion(code):
+            return legal
+    raise ValueError(f'illegal move: {uci}')
+
+
+def play(engine, moves):
+    for uci in moves:
+        engine.make_code(legal_code(engine, uci))
+
+
+def key(engine):
+    return polyglot_key(engine.board, engine.next_player)
+
+
+class PolyglotKeyTest(unittest.TestCase):
+
+    def test_reference_keys(self):
+        engine = Engine()
+        for moves, expected in REFERENCE_KEYS:
+            engine.reset()
+            play(engine, moves)
+            self.assertEqual(key(engine), expected, ' '.join(moves))
+
+    def test_castling_moves(self):
+        # castling is stored as the king taking its own rook
+        engine = Engine()
+        engine.set_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        for uci, rook_file in (('e1g1', 7), ('e1c1', 0)):
+            code = legal_code(engine, uci)
+            move = encode_move(engine.board, code)
+            self.assertEqual(move, 4 << 6 | rook_file)
+            self.assertEqual(decode_move(engine.board, move),
+                             (movecode.from_square(code), movecode.to_square(code), None))
+
+    def test_promotion_moves(self):
+        engine = Engine()
+        engine.set_fen('8/P6k/8/8/8/8/8/K7 w - - 0 1')
+        code = legal_code(engine, 'a7a8n')
+        move = encode_move(engine.board, code)
+        self.assertEqual(decode_move(engine.board, move)[2], 'knight')
+
+
+class BookTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        engine = Engine()
+        self.start_key = key(engine)
+        self.moves = {uci: encode_move(engine.board, legal_code(engine, uci))
+                      for uci in ('e2e4', 'd2d4', 'g1f3', 'e2e3')}
+        play(engine, ['e2e4'])
+        self.e4_key = key(engine)
+        self.e5 = encode_move(engine.board, legal_code(engine, 'e7e5'))
+        # unsorted on purpose; write_book sorts by key and weight
+        self.entries = [
+            BookEntry(self.e4_key, self.e5, 7),
+            BookEntry(self.start_key, self.moves['d2d4'], 30),
+            BookEntry(self.start_key, self.moves['e2e4'], 60),
+            BookEntry(self.start_key, self.moves['g1f3'], 10),
+            BookEntry(self.start_key, self.moves['e2e3'], 0),
+            BookEntry(0xFFFFFFFFFFFFFFFF, 0, 1),
+            BookEntry(1, 0, 1),
+        ]
+        self.assertEqual(write_book(self.path, self.entries), len(self.entries))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        with Book(self.path) as book:
+            self.assertEqual(len(book), len(self.entries))
+            found = book.entries(self.start_key)
+            self.assertEqual([entry.weight for entry in found], [60, 30, 10, 0])
+            self.assertEqual([entry.move for entry in found],
+                             [self.moves[uci] for uci in ('e2e4', 'd2d4', 'g1f3', 'e2e3')])
+            self.assertEqual([(entry.move, entry.weight) for entry in book.entries(self.e4_key)],
+                             [(self.e5, 7)])
+            self.assertEqual(len(book.entries(1)), 1)
+            self.assertEqual(len(book.entries(0xFFFFFFFFFFFFFFFF)), 1)
+            self.assertEqual(book.entries(2), [])
+
+    def test_empty_book(self):
+        write_book(self.path, [])
+        with Book(self.path) as book:
+            self.assertEqual(len(book), 0)
+            self.assertEqual(book.entries(self.start_key), [])
+
+    def test_book_move(self):
+        engine = Engine()
+        engine.open_book(self.path)
+        try:
+            self.assertIn(movecode.uci(engine.book_move(random.Random(1))), self.moves)
+            play(engine, ['e2e4'])
+            self.assertEqual(movecode.uci(engine.book_move()), 'e7e5')
+            play(engine, ['e7e5'])
+            self.assertIsNone(engine.book_move())
+        finally:
+            engine.close_book()
+        self.assertIsNone(engine.book_move())
+
+    def test_weighted_choice(self):
+        engine = Engine()
+        rng = random.Random(2024)
+        counts = dict.fromkeys(self.moves, 0)
+        with Book(self.path) as book:
+            for i in range(5000):
+                counts[movecode.uci(book_move(engine, book, rng))] += 1
+        # weights 60 / 30 / 10 / 0
+        self.assertEqual(counts['e2e3'], 0)
+        self.assertAlmostEqual(counts['e2e4'] / 5000, 0.6, delta=0.03)
+        self.assertAlmostEqual(counts['d2d4'] / 5000, 0.3, delta=0.03)
+        self.assertAlmostEqual(counts['g1f3'] / 5000, 0.1, delta=0.03)
+
+    def test_zero_weights_and_illegal_entries(self):
+        engine = Engine()
+        # e2e5 isn't legal and is skipped; the rest all have weight 0
+        illegal = encode_move(engine.board, movecode.from_uci('e2e5'))
+        write_book(self.path, [BookEntry(self.start_key, self.moves['e2e4'], 0),
+                               BookEntry(self.start_key, self.moves['d2d4'], 0),
+                               BookEntry(self.start_key, illegal, 50)])
+        rng = random.Random(7)
+        with Book(self.path) as book:
+            played = {movecode.uci(book_move(engine, book, rng)) for i in range(200)}
+        self.assertEqual(played, {'e2e4', 'd2d4'})
+
+
+if __name__ == '__main__':
+    unittest.main()
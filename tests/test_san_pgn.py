@@ -0,0 +1,166 @@
+import io
+import unittest
+
+from src.core.engine import Engine
+from src.core.perft import POSITIONS
+from src.core.san import san, parse_san
+from src.core.pgn import PGNGame, read_games, replay, format_game, write_games
+from src.core import movecode
+
+PGN = '''[Event "First"]
+[White "A"]
+[Black "B"]
+
+1. e4 {best by test} e5 2. Nf3 $1 (2. f4 exf4 (2... d5) 3. Nf3) Nc6
+3. Bb5 {a comment running
+over two lines} a6 ; rest of line
+4. Ba4 $2 Nf6 1-0
+
+[Event "Second"]
+[SetUp "1"]
+[FEN "4k3/8/8/8/8/8/8/R3K3 w - - 0 1"]
+
+1. Ra8+ Kd7 2. Ra7+ (2. Kd2) Ke6 *
+
+[Event "Third"]
+
+1. d4 d5
+
+[Event "Fourth"]
+
+1. e4 e5 2. Bc4 Nc6 3. Qh5 Nf6?? 4. Qxf7# 1-0
+'''
+
+
+def engine_at(fen):
+    engine = Engine()
+    engine.set_fen(fen)
+    return engine
+
+
+def san_of(engine, uci):
+    for code in engine.legal_moves():
+        if movecode.uci(code) == uci:
+            return san(engine, code)
+    raise ValueError(f'illegal move: {uci}')
+
+
+class SANTest(unittest.TestCase):
+
+    def test_disambiguation(self):
+        # by file: knights on b1 and f1
+        engine = engine_at('4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1')
+        self.assertEqual(san_of(engine, 'b1d2'), 'Nbd2')
+        self.assertEqual(san_of(engine, 'f1d2'), 'Nfd2')
+        # by rank: rooks on a1 and a5
+        engine = engine_at('4k3/8/8/R7/8/8/8/R3K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'a1a3'), 'R1a3')
+        self.assertEqual(san_of(engine, 'a5a3'), 'R5a3')
+        # by both: queens on a1, a3 and c1
+        engine = engine_at('4k3/8/8/8/8/Q7/8/Q1Q1K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'a1b2'), 'Qa1b2')
+        self.assertEqual(san_of(engine, 'a3b2'), 'Q3b2')
+        self.assertEqual(san_of(engine, 'c1b2'), 'Qcb2')
+
+    def test_pinned_rival_needs_no_disambiguation(self):
+        # the c3 knight is pinned against the king, so only Ne2-d4 is legal
+        engine = engine_at('4k3/8/8/b7/8/2N5/4N3/4K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'e2d4'), 'Nd4')
+
+    def test_castling(self):
+        engine = engine_at('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        self.assertEqual(san_of(engine, 'e1g1'), 'O-O')
+        self.assertEqual(san_of(engine, 'e1c1'), 'O-O-O')
+        engine = engine_at('r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1')
+        self.assertEqual(san_of(engine, 'e8g8'), 'O-O')
+        self.assertEqual(san_of(engine, 'e8c8'), 'O-O-O')
+
+    def test_promotion(self):
+        engine = engine_at('1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'a7a8q'), 'a8=Q')
+        self.assertEqual(san_of(engine, 'a7a8n'), 'a8=N')
+        self.assertEqual(san_of(engine, 'a7b8q'), 'axb8=Q+')
+        self.assertEqual(san_of(engine, 'a7b8r'), 'axb8=R+')
+        self.assertEqual(san_of(engine, 'a7b8b'), 'axb8=B')
+
+    def test_check_and_mate(self):
+        engine = engine_at('4k3/8/8/8/8/8/8/R3K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'a1a8'), 'Ra8+')
+        self.assertEqual(san_of(engine, 'a1a2'), 'Ra2')
+        engine = engine_at('6k1/5ppp/8/8/8/8/8/R3K3 w - - 0 1')
+        self.assertEqual(san_of(engine, 'a1a8'), 'Ra8#')
+
+    def test_parse_round_trip(self):
+        for name, fen, expected in POSITIONS:
+            engine = engine_at(fen)
+            legal = engine.legal_moves()
+            for code in legal:
+                text = san(engine, code)
+                with self.subTest(position=name, san=text):
+                    self.assertEqual(parse_san(engine, text), code)
+                    self.assertEqual(parse_san(engine, text, legal), code)
+
+    def test_parse_variants(self):
+        engine = engine_at('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        self.assertEqual(movecode.uci(parse_san(engine, '0-0')), 'e1g1')
+        self.assertEqual(movecode.uci(parse_san(engine, 'O-O-O+!?')), 'e1c1')
+        engine = engine_at('1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+        self.assertEqual(movecode.uci(parse_san(engine, 'a8Q')), 'a7a8q')
+        self.assertEqual(movecode.uci(parse_san(engine, 'axb8=N')), 'a7b8n')
+
+    def test_parse_rejects(self):
+        engine = engine_at('4k3/8/8/8/8/8/8/1N2KN2 w - - 0 1')
+        for text in ('Nd2', 'Nc4', 'O-O', 'Zz9', 'e4'):
+            with self.subTest(san=text):
+                with self.assertRaises(ValueError):
+                    parse_san(engine, text)
+
+
+class PGNTest(unittest.TestCase):
+
+    def test_read_games(self):
+        games = read_games(io.StringIO(PGN))
+        first = next(games)
+        self.assertEqual(first.headers, {'Event': 'First', 'White': 'A', 'Black': 'B'})
+        self.assertEqual(first.moves, ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6', 'Ba4', 'Nf6'])
+        self.assertEqual(first.result, '1-0')
+
+        second = next(games)
+        self.assertEqual(second.fen, '4k3/8/8/8/8/8/8/R3K3 w - - 0 1')
+        self.assertEqual(second.moves, ['Ra8+', 'Kd7', 'Ra7+', 'Ke6'])
+        self.assertEqual(second.result, '*')
+
+        # no result token: the next game's tags end it
+        third = next(games)
+        self.assertEqual(third.moves, ['d4', 'd5'])
+        self.assertEqual(third.result, '*')
+
+        fourth = next(games)
+        self.assertEqual(fourth.moves[-2:], ['Nf6??', 'Qxf7#'])
+        self.assertEqual(list(games), [])
+
+    def test_replay(self):
+        engine = Engine()
+        for game in read_games(io.StringIO(PGN)):
+            codes = list(replay(engine, game))
+            self.assertEqual(len(codes), len(game.moves))
+        # the last game ends in mate
+        self.assertEqual(engine.legal_moves(), [])
+        self.assertTrue(engine.is_king_attacked(engine.board, engine.next_player))
+
+    def test_write_and_read_back(self):
+        games = list(read_games(io.StringIO(PGN)))
+        out = io.StringIO()
+        self.assertEqual(write_games(out, games), len(games))
+        again = list(read_games(io.StringIO(out.getvalue())))
+        self.assertEqual([game.moves for game in again], [game.moves for game in games])
+        self.assertEqual([game.result for game in again], [game.result for game in games])
+        self.assertEqual(again[1].fen, games[1].fen)
+
+    def test_format_from_black(self):
+        game = PGNGame({'FEN': '4k3/8/8/8/8/8/8/R3K3 b - - 0 12'}, ['Kd7', 'Ra7+'], '*')
+        self.assertTrue(format_game(game).endswith('12... Kd7 13. Ra7+ *\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from src.uci import UCIEngine, UCIPool, UCIResult, move_for
+from src.core.engine import Engine
+from src.core.fen import START_FEN
+from src.core.search import MATE, MATE_BOUND
+from src.core import movecode
+
+FAKE_ENGINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_uci_engine.py')
+CRASH_FEN = '8/8/8/8/8/8/8/8 w - - 0 1'
+GARBAGE_FEN = '8/8/8/8/8/8/8/K6k w - - 0 1'
+
+
+def setUpModule():
+    # UCIEngine runs a single executable, so wrap the script in one
+    global engine_path
+    fd, engine_path = tempfile.mkstemp(suffix='.sh')
+    with os.fdopen(fd, 'w') as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_ENGINE}" "$@"\n')
+    os.chmod(engine_path, 0o755)
+
+
+def tearDownModule():
+    os.remove(engine_path)
+
+
+@unittest.skipUnless(os.name == 'posix', 'the fake engine is started through a shell script')
+class UCIEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = UCIEngine(engine_path, {'Hash': 32})
+
+    def tearDown(self):
+        self.engine.quit()
+
+    def test_handshake(self):
+        self.assertEqual(self.engine.name, 'Fake UCI')
+        self.engine.new_game()
+
+    def test_analyse(self):
+        result = self.engine.analyse(START_FEN, depth=3)
+        self.assertEqual(result.bestmove, 'e2e4')
+        self.assertEqual(result.ponder, 'e7e5')
+        self.assertEqual(result.depth, 3)
+        self.assertEqual(result.score, 0.25)
+        self.assertIsNone(result.mate)
+        self.assertEqual(result.pv, ['e2e4', 'e7e5'])
+        self.assertEqual(result.nodes, 1000)
+        self.assertEqual(result.time, 0.01)
+
+    def test_analyse_with_moves(self):
+        result = self.engine.analyse(START_FEN, ['e2e4'], depth=1)
+        self.assertEqual(result.bestmove, 'e7e5')
+        self.assertIsNone(result.ponder)
+        self.assertEqual(result.score, -0.25)
+        # the engine is still usable after a query
+        self.assertEqual(self.engine.analyse(START_FEN, depth=1).bestmove, 'e2e4')
+
+    def test_crash(self):
+        with self.assertRaises(EOFError):
+            self.engine.analyse(CRASH_FEN, depth=1)
+
+    def test_malformed_reply(self):
+        result = self.engine.analyse(GARBAGE_FEN, depth=1)
+        self.assertIsNone(result.bestmove)
+        self.assertIsNone(result.ponder)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(result.score, 0.0)
+        self.assertEqual(result.nodes, 12)
+        self.assertEqual(result.pv, [])
+
+
+@unittest.skipUnless(os.name == 'posix', 'the fake engine is started through a shell script')
+class UCIPoolTest(unittest.TestCase):
+
+    def test_submit_engine(self):
+        engine = Engine()
+        piece, move = move_for(engine.board, 'e2e4')
+        engine.move(piece, move)
+        with UCIPool(engine_path, size=2) as pool:
+            futures = [pool.submit_engine(engine, depth=2) for i in range(4)]
+            for future in futures:
+                self.assertEqual(future.result(timeout=10).bestmove, 'e7e5')
+
+    def test_crashed_engine_is_replaced(self):
+        with UCIPool(engine_path, size=1) as pool:
+            crashed = pool.engines[0]
+            with self.assertRaises(EOFError):
+                pool.analyse(CRASH_FEN, depth=1)
+            self.assertEqual(len(pool.engines), 1)
+            self.assertIsNot(pool.engines[0], crashed)
+            self.assertEqual(pool.analyse(START_FEN, depth=1).bestmove, 'e2e4')
+
+    def test_engine_returned_after_error(self):
+        with UCIPool(engine_path, size=1) as pool:
+            engine = pool.engines[0]
+            # a bad movetime fails before go is sent
+            with self.assertRaises(ValueError):
+                pool.analyse(START_FEN, depth=1, movetime='soon')
+            self.assertIs(pool.engines[0], engine)
+            self.assertEqual(pool.analyse(START_FEN, depth=1).bestmove, 'e2e4')
+
+
+class UCIResultTest(unittest.TestCase):
+
+    def test_mate_score_in_pawns(self):
+        result = UCIResult()
+        result.parse_info('info depth 5 score mate 1 pv a1a8')
+        self.assertEqual(result.mate, 1)
+        self.assertEqual(result.score, MATE - 1)
+        self.assertGreaterEqual(result.score, MATE_BOUND)
+        result.parse_info('info depth 6 score mate -2 pv a1a8')
+        self.assertEqual(result.mate, -2)
+        self.assertEqual(result.score, -(MATE - 4))
+        result.parse_info('info depth 7 score cp 150')
+        self.assertIsNone(result.mate)
+        self.assertEqual(result.score, 1.5)
+
+    def test_invalid_uci_moves(self):
+        for text in ('e7e8k', 'a9a1', 'e2e', 'x2e4'):
+            with self.assertRaises(ValueError):
+                movecode.from_uci(text)
+        self.assertEqual(movecode.promotion(movecode.from_uci('e7e8n')), 'knight')
+
+
+if __name__ == '__main__':
+    unittest.main()